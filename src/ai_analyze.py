@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import json
 import logging
-from dataclasses import dataclass, field, replace
-from typing import Any
-
-from openai import OpenAI
+import random
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable
+
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    AuthenticationError,
+    RateLimitError,
+)
 
 from src.market import MarketData
 from src.news import Article
@@ -32,6 +45,35 @@ except ImportError:
     _HAS_GOOGLE = False
     logger.debug("google-generativeai package not installed; Google provider unavailable")
 
+try:
+    import orjson as _orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+    logger.debug("orjson package not installed; falling back to stdlib json")
+
+try:
+    import msgspec as _msgspec
+    _HAS_MSGSPEC = True
+except ImportError:
+    _HAS_MSGSPEC = False
+    logger.debug("msgspec package not installed; using dict-based response parsing")
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON with orjson when available (orjson.JSONDecodeError subclasses
+    json.JSONDecodeError, so callers' except clauses work for both)."""
+    if _HAS_ORJSON:
+        return _orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_dumps_compact(obj: Any) -> str:
+    """Serialize to compact JSON (no whitespace) with orjson when available."""
+    if _HAS_ORJSON:
+        return _orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
 # ---------------------------------------------------------------------------
 # Analysis result model
 # ---------------------------------------------------------------------------
@@ -39,8 +81,13 @@ except ImportError:
 VALID_SENTIMENTS = {"positive", "negative", "mixed", "neutral"}
 VALID_BIASES = {"likely_up", "likely_down", "uncertain"}
 
+# Identity maps so enum coercion is a single .get() with default, instead of
+# a membership test plus a branch, on the hot parse path.
+_SENTIMENT_MAP = {s: s for s in VALID_SENTIMENTS}
+_BIAS_MAP = {b: b for b in VALID_BIASES}
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AnalysisResult:
     news_sentiment: str  # positive | negative | mixed | neutral
     key_drivers: list[str]
@@ -64,34 +111,15 @@ class AnalysisResult:
 # Prompt builders (shared across all providers)
 # ---------------------------------------------------------------------------
 
-def _build_prompt(articles: list[Article], market: MarketData, cfg: Config) -> str:
-    headlines = [
-        {"title": a.title, "source": a.source, "published": a.published, "url": a.url}
-        for a in articles[:30]
-    ]
-    market_info = {
-        "ticker": market.ticker,
-        "last_close": market.last_close,
-        "last_close_date": market.last_close_date,
-        "sma_7": market.sma_7,
-        "sma_21": market.sma_21,
-        "close_vs_sma7": market.close_vs_sma7,
-        "return_7d_pct": market.return_7d_pct,
-        "rsi_14": market.rsi_14,
-        "bb_upper": market.bb_upper,
-        "bb_middle": market.bb_middle,
-        "bb_lower": market.bb_lower,
-        "bb_position": market.bb_position,
-        "vol_10d_avg": market.vol_10d_avg,
-        "vol_vs_avg": market.vol_vs_avg,
-    }
-    return f"""You are a financial analyst assistant. Analyze the following news headlines and market data for {cfg.topic} ({cfg.ticker}).
+# The invariant prompt body (schema + rules) lives in one module-level
+# template; only the four placeholders change between calls.
+_PROMPT_TEMPLATE = """You are a financial analyst assistant. Analyze the following news headlines and market data for {topic} ({ticker}).
 
 NEWS HEADLINES:
-{json.dumps(headlines, indent=2)}
+{headlines}
 
 MARKET INDICATORS:
-{json.dumps(market_info, indent=2)}
+{market_info}
 
 Based on the above, produce a JSON object with EXACTLY this schema (no extra keys, no markdown fences):
 {{
@@ -111,37 +139,173 @@ Rules:
 - Return ONLY the JSON object. No markdown, no explanation outside the JSON."""
 
 
-def _build_strict_retry_prompt(articles: list[Article], market: MarketData, cfg: Config) -> str:
-    return _build_prompt(articles, market, cfg) + """
+def _build_prompt(articles: list[Article], market: MarketData, cfg: Config) -> str:
+    """Render the analysis prompt, memoized on content fingerprints.
+
+    The same prompt body is requested up to twice per provider per analyze
+    call (first attempt + strict retry) and once per provider in ensemble
+    mode, so the rendered text is cached on hashable fingerprints of the
+    inputs rather than rebuilt each time.
+    """
+    articles_key = tuple(a.prompt_key for a in articles[:30])
+    return _build_prompt_cached(articles_key, market.prompt_items, cfg.topic, cfg.ticker)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_prompt_cached(
+    articles_key: tuple[tuple[str, str, str, str], ...],
+    market_key: tuple[tuple[str, Any], ...],
+    topic: str,
+    ticker: str,
+) -> str:
+    # Input tokens cost latency and money linearly, so keep the payload lean:
+    # drop url (no analytical value) and last_close_date (redundant with the
+    # ticker context), serialize compactly, and round floats to 4 decimals.
+    headlines = [
+        {"title": title, "source": source, "published": published}
+        for title, source, published, _url in articles_key
+    ]
+    market_info = {
+        key: round(value, 4) if isinstance(value, float) else value
+        for key, value in market_key
+        if key != "last_close_date"
+    }
+    return _PROMPT_TEMPLATE.format(
+        topic=topic,
+        ticker=ticker,
+        headlines=_json_dumps_compact(headlines),
+        market_info=_json_dumps_compact(market_info),
+    )
+
+
+_RETRY_SUFFIX = """
 
 CRITICAL: Your previous response was not valid JSON. You MUST return ONLY a raw JSON object.
 Do NOT wrap it in ```json``` or any markdown. Do NOT add any text before or after the JSON.
 The response must start with { and end with }."""
 
 
+def _build_strict_retry_prompt(articles: list[Article], market: MarketData, cfg: Config) -> str:
+    return _build_prompt(articles, market, cfg) + _RETRY_SUFFIX
+
+
 # ---------------------------------------------------------------------------
 # Response parser (shared)
 # ---------------------------------------------------------------------------
 
+class _BraceTracker:
+    """Track JSON brace depth across streamed chunks.
+
+    Lets streaming backends stop reading as soon as the top-level object
+    closes, instead of waiting for the server's final flush. Braces inside
+    string literals (including escaped quotes) are ignored.
+    """
+
+    __slots__ = ("_depth", "_in_string", "_escaped", "_started")
+
+    def __init__(self) -> None:
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._started = False
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk; return True once the top-level object has closed."""
+        for ch in chunk:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+                self._started = True
+            elif ch == "}":
+                self._depth -= 1
+                if self._started and self._depth == 0:
+                    return True
+        return False
+
+
+if _HAS_MSGSPEC:
+    class _RawAnalysis(_msgspec.Struct):
+        """Schema mirror of AnalysisResult for one-pass decode + validation.
+
+        msgspec decodes and type-checks in a single C pass, skipping the
+        intermediate dict and the per-field isinstance/get calls of the
+        stdlib path. Enum membership and clamping still happen in Python.
+        """
+
+        news_sentiment: str = "neutral"
+        key_drivers: list[str] = []
+        risk_factors: list[str] = []
+        directional_bias: str = "uncertain"
+        confidence_0_100: int = 50
+        one_paragraph_rationale: str = "No rationale provided."
+
+
+def _from_struct(struct: "_RawAnalysis") -> AnalysisResult:
+    """Post-validate a msgspec-decoded struct into an AnalysisResult."""
+    sentiment = _SENTIMENT_MAP.get(struct.news_sentiment, "neutral")
+    bias = _BIAS_MAP.get(struct.directional_bias, "uncertain")
+    return AnalysisResult(
+        news_sentiment=sentiment,
+        key_drivers=struct.key_drivers[:5],
+        risk_factors=struct.risk_factors[:5],
+        directional_bias=bias,
+        confidence_0_100=max(0, min(100, struct.confidence_0_100)),
+        one_paragraph_rationale=struct.one_paragraph_rationale,
+    )
+
+
+# Matches a fenced code block wrapping the whole response; group 1 is the body.
+# One C-side regex pass replaces the previous startswith/index/endswith/strip
+# sequence of Python string scans. The closing fence is optional, matching the
+# original endswith-based strip: a truncated response with complete JSON
+# inside still parses.
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*\n(.*?)(?:\n?\s*```)?\s*$", re.DOTALL)
+
+# Just the opening fence, for streamed responses that were cut off before
+# the closing fence arrived.
+_OPEN_FENCE_RE = re.compile(r"\s*```(?:json)?\s*\n")
+
+
+@functools.lru_cache(maxsize=64)
+def _decode_payload(text: str) -> Any:
+    """Decode a (possibly fenced) JSON payload, memoized on the exact text.
+
+    Identical model output — disk-cache replays, the strict-retry path
+    re-parsing the same body — skips the JSON parse entirely. Callers treat
+    the returned mapping as read-only. Failures raise and are not cached.
+    """
+    try:
+        # Fast path: structured-output providers return raw JSON with no fences.
+        return _json_loads(text)
+    except json.JSONDecodeError:
+        match = _FENCE_RE.match(text)
+        if match is None:
+            raise
+        return _json_loads(match.group(1))
+
+
 def _parse_analysis(raw: str) -> AnalysisResult:
     """Parse and validate the AI response. Raises ValueError on failure."""
     text = raw.strip()
-    if text.startswith("```"):
-        first_newline = text.index("\n") if "\n" in text else 3
-        text = text[first_newline + 1:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
-
-    data = json.loads(text)
-
-    sentiment = data.get("news_sentiment", "neutral")
-    if sentiment not in VALID_SENTIMENTS:
-        sentiment = "neutral"
+    if _HAS_MSGSPEC:
+        try:
+            return _from_struct(_msgspec.json.decode(text, type=_RawAnalysis))
+        except _msgspec.DecodeError:
+            # Fenced or loosely-typed payloads fall through to the lenient
+            # dict-based path below.
+            pass
+    data = _decode_payload(text)
 
-    bias = data.get("directional_bias", "uncertain")
-    if bias not in VALID_BIASES:
-        bias = "uncertain"
+    sentiment = _SENTIMENT_MAP.get(data.get("news_sentiment"), "neutral")
+    bias = _BIAS_MAP.get(data.get("directional_bias"), "uncertain")
 
     drivers = data.get("key_drivers", [])
     if not isinstance(drivers, list):
@@ -213,174 +377,482 @@ def _apply_confidence_threshold(result: AnalysisResult, threshold: int) -> Analy
 
 
 # ---------------------------------------------------------------------------
-# Provider-specific backends
+# Provider-specific backends (async)
+#
+# Each backend raises on total failure; the dispatchers below translate
+# failures into the rule-based fallback so callers never see an exception.
 # ---------------------------------------------------------------------------
 
-def _analyze_openai(articles: list[Article], market: MarketData, cfg: Config) -> AnalysisResult:
-    """Analyze using OpenAI API."""
-    if not cfg.openai_api_key:
-        logger.warning("No OPENAI_API_KEY set, using rule-based fallback")
-        return _rule_based_fallback(articles, market)
+_SYSTEM_MESSAGE = "You are a financial analyst. Respond only with valid JSON."
+
+# The schema caps key_drivers/risk_factors at 5 items and the rationale at
+# 2-4 sentences, so real responses run 200-400 tokens; 512 leaves headroom
+# while keeping billed/preallocated output small on providers that charge by
+# the cap. If the schema ever grows, bump this alongside it — a truncated
+# response fails JSON parsing and falls back to rules.
+_MAX_OUTPUT_TOKENS = 512
+
+# Error classes that warrant a backed-off retry (rate limits, timeouts,
+# connection drops) vs ones where a second attempt is pointless (bad key).
+# JSONDecodeError is retried too, but immediately — waiting doesn't make the
+# model's next answer better-formed.
+_TRANSIENT_ERRORS: tuple[type[Exception], ...] = (
+    RateLimitError, APITimeoutError, APIConnectionError,
+)
+_FATAL_ERRORS: tuple[type[Exception], ...] = (AuthenticationError,)
+if _HAS_ANTHROPIC:
+    _TRANSIENT_ERRORS += (
+        _anthropic.RateLimitError, _anthropic.APITimeoutError, _anthropic.APIConnectionError,
+    )
+    _FATAL_ERRORS += (_anthropic.AuthenticationError,)
 
-    client = OpenAI(api_key=cfg.openai_api_key)
-    for attempt in range(2):
-        prompt_fn = _build_prompt if attempt == 0 else _build_strict_retry_prompt
-        prompt = prompt_fn(articles, market, cfg)
-        try:
-            logger.info("Calling OpenAI (%s), attempt %d", cfg.openai_model, attempt + 1)
-            response = client.chat.completions.create(
-                model=cfg.openai_model,
-                messages=[
-                    {"role": "system", "content": "You are a financial analyst. Respond only with valid JSON."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.3,
-                max_tokens=1000,
-                response_format={"type": "json_object"},
-            )
-            raw = response.choices[0].message.content or ""
-            result = _parse_analysis(raw)
-            result = _apply_confidence_threshold(result, cfg.confidence_threshold)
-            logger.info("OpenAI: sentiment=%s, bias=%s, confidence=%d",
-                        result.news_sentiment, result.directional_bias, result.confidence_0_100)
-            return result
-        except json.JSONDecodeError as exc:
-            logger.warning("OpenAI JSON parse failed (attempt %d): %s", attempt + 1, exc)
-        except Exception as exc:
-            logger.error("OpenAI API error (attempt %d): %s", attempt + 1, exc)
+_BACKOFF_INITIAL = 0.5
+_BACKOFF_MAX = 4.0
 
-    return _rule_based_fallback(articles, market)
 
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter (0.5s base, 4s cap)."""
+    return random.uniform(0, min(_BACKOFF_MAX, _BACKOFF_INITIAL * 2 ** attempt))
 
-def _analyze_claude(articles: list[Article], market: MarketData, cfg: Config) -> AnalysisResult:
-    """Analyze using Anthropic Claude API."""
-    if not _HAS_ANTHROPIC:
-        logger.error("anthropic package not installed. Install with: pip install anthropic")
-        return _rule_based_fallback(articles, market)
-    if not cfg.claude_api_key:
-        logger.warning("No CLAUDE_API_KEY set, using rule-based fallback")
-        return _rule_based_fallback(articles, market)
 
-    client = _anthropic.Anthropic(api_key=cfg.claude_api_key)  # type: ignore[union-attr]
-    for attempt in range(2):
-        prompt_fn = _build_prompt if attempt == 0 else _build_strict_retry_prompt
-        prompt = prompt_fn(articles, market, cfg)
-        try:
-            logger.info("Calling Claude (%s), attempt %d", cfg.claude_model, attempt + 1)
-            message = client.messages.create(
-                model=cfg.claude_model,
-                max_tokens=1024,
-                system="You are a financial analyst. Respond only with valid JSON.",
-                messages=[{"role": "user", "content": prompt}],
-            )
-            raw = message.content[0].text if message.content else ""
-            result = _parse_analysis(raw)
-            result = _apply_confidence_threshold(result, cfg.confidence_threshold)
-            logger.info("Claude: sentiment=%s, bias=%s, confidence=%d",
-                        result.news_sentiment, result.directional_bias, result.confidence_0_100)
-            return result
-        except json.JSONDecodeError as exc:
-            logger.warning("Claude JSON parse failed (attempt %d): %s", attempt + 1, exc)
-        except Exception as exc:
-            logger.error("Claude API error (attempt %d): %s", attempt + 1, exc)
+# ---------------------------------------------------------------------------
+# On-disk raw-response cache
+#
+# Scheduled poll jobs restart between runs, so the in-memory LRU alone cannot
+# prevent a repeated LLM call after a crash/restart. Raw responses are kept
+# as one JSON file per prompt hash under data/ai_cache/, honouring the same
+# enable flag and TTL as the in-memory cache. All I/O errors are swallowed —
+# the cache is an accelerator, never a dependency.
+# ---------------------------------------------------------------------------
 
-    return _rule_based_fallback(articles, market)
+def _disk_cache_key(prompt: str, provider: str, model: str) -> str:
+    payload = f"{provider}|{model}|{prompt}"
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _disk_cache_get(cfg: Config, prompt: str, provider: str, model: str) -> str | None:
+    """Return the cached raw response, or None on miss/expiry/error."""
+    if not cfg.enable_analysis_cache:
+        return None
+    path = cfg.data_dir / "ai_cache" / f"{_disk_cache_key(prompt, provider, model)}.json"
+    try:
+        entry = _json_loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if time.time() - entry.get("ts", 0) > cfg.analysis_cache_ttl:
+        return None
+    logger.info("Disk cache hit for %s (%s)", provider, model)
+    return entry.get("raw")
+
+
+def _disk_cache_put(cfg: Config, prompt: str, provider: str, model: str, raw: str) -> None:
+    if not cfg.enable_analysis_cache:
+        return
+    try:
+        cache_dir = cfg.data_dir / "ai_cache"
+        cache_dir.mkdir(exist_ok=True)
+        path = cache_dir / f"{_disk_cache_key(prompt, provider, model)}.json"
+        path.write_text(
+            json.dumps({"raw": raw, "ts": time.time(), "provider": provider, "model": model}),
+            encoding="utf-8",
+        )
+    except Exception as exc:
+        logger.debug("Could not write AI disk cache: %s", exc)
 
+# Client construction does TLS/connection-pool setup, so cache instances
+# keyed on credentials; reused clients keep warm keep-alive pools. The
+# async clients hold httpx pools that are bound to the event loop they
+# were created on, so the cache key must also include the running loop:
+# a client reused across asyncio.run calls dies with "Event loop is
+# closed" on the second call. Within one long-lived loop (Streamlit,
+# ensemble runs) clients are still shared.
+_configured_google_keys: set[str] = set()
+
+
+@functools.lru_cache(maxsize=8)
+def _openai_client_for_loop(
+    api_key: str, base_url: str | None, loop: asyncio.AbstractEventLoop
+) -> AsyncOpenAI:
+    return AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+
+def _openai_client(api_key: str, base_url: str | None = None) -> AsyncOpenAI:
+    return _openai_client_for_loop(api_key, base_url, asyncio.get_running_loop())
 
-def _analyze_google(articles: list[Article], market: MarketData, cfg: Config) -> AnalysisResult:
-    """Analyze using Google Gemini API."""
-    if not _HAS_GOOGLE:
-        logger.error("google-generativeai package not installed. Install with: pip install google-generativeai")
-        return _rule_based_fallback(articles, market)
-    if not cfg.google_api_key:
-        logger.warning("No GOOGLE_API_KEY set, using rule-based fallback")
-        return _rule_based_fallback(articles, market)
 
-    _genai.configure(api_key=cfg.google_api_key)  # type: ignore[union-attr]
-    model = _genai.GenerativeModel(  # type: ignore[union-attr]
-        cfg.google_model,
-        system_instruction="You are a financial analyst. Respond only with valid JSON.",
+@functools.lru_cache(maxsize=8)
+def _claude_client_for_loop(api_key: str, loop: asyncio.AbstractEventLoop) -> Any:
+    return _anthropic.AsyncAnthropic(api_key=api_key)  # type: ignore[union-attr]
+
+
+def _claude_client(api_key: str) -> Any:
+    return _claude_client_for_loop(api_key, asyncio.get_running_loop())
+
+
+@functools.lru_cache(maxsize=8)
+def _google_model(api_key: str, model_name: str) -> Any:
+    if api_key not in _configured_google_keys:
+        _genai.configure(api_key=api_key)  # type: ignore[union-attr]
+        _configured_google_keys.add(api_key)
+    return _genai.GenerativeModel(  # type: ignore[union-attr]
+        model_name,
+        system_instruction=_SYSTEM_MESSAGE,
+    )
+
+
+@dataclass(frozen=True)
+class BackendSpec:
+    """Table entry describing one provider for the fused dispatcher.
+
+    ``call`` performs a single raw API round-trip: (cfg, prompt, model) ->
+    response text. Everything else — key check, disk cache, retry policy,
+    parsing — lives once in :func:`_analyze_via` instead of being copied
+    per provider.
+    """
+
+    provider: str      # dict key, also the disk-cache namespace
+    name: str          # human label for log lines
+    key_field: str     # Config attribute holding the API key
+    key_env: str       # env var name for the missing-key error
+    model_field: str   # Config attribute holding the model name
+    call: Callable[[Config, str, str], Awaitable[str]]
+    # Providers without a native JSON output mode get the strict-retry
+    # prompt after a parse failure.
+    strict_retry: bool = False
+
+
+async def _call_openai(cfg: Config, prompt: str, model: str) -> str:
+    client = _openai_client(cfg.openai_api_key)
+    # Stream the response and stop as soon as the JSON object closes;
+    # LLM decode is serial, so this trims the tail of each call.
+    # response_format=json_object guarantees syntactically valid JSON.
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": _SYSTEM_MESSAGE},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.3,
+        max_tokens=_MAX_OUTPUT_TOKENS,
+        response_format={"type": "json_object"},
+        stream=True,
+    )
+    buf: list[str] = []
+    tracker = _BraceTracker()
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            continue
+        buf.append(delta)
+        if tracker.feed(delta):
+            await stream.close()
+            break
+    return "".join(buf)
+
+
+async def _call_claude(cfg: Config, prompt: str, model: str) -> str:
+    if not _HAS_ANTHROPIC:
+        raise ImportError("anthropic package not installed. Install with: pip install anthropic")
+    client = _claude_client(cfg.claude_api_key)
+    buf: list[str] = []
+    tracker = _BraceTracker()
+    async with client.messages.stream(
+        model=model,
+        max_tokens=_MAX_OUTPUT_TOKENS,
+        system=_SYSTEM_MESSAGE,
+        messages=[{"role": "user", "content": prompt}],
+    ) as stream:
+        async for delta in stream.text_stream:
+            buf.append(delta)
+            if tracker.feed(delta):
+                break
+    text = "".join(buf)
+    # Claude has no native JSON output mode and often wraps the object in a
+    # markdown fence. The early close above stops mid-chunk at the final
+    # "}", dropping some or all of the closing fence, so strip the opening
+    # fence plus anything after the last brace and hand the parser bare JSON.
+    match = _OPEN_FENCE_RE.match(text)
+    if match:
+        end = text.rfind("}")
+        text = text[match.end(): end + 1] if end != -1 else text[match.end():]
+    return text
+
+
+async def _call_google(cfg: Config, prompt: str, model: str) -> str:
+    if not _HAS_GOOGLE:
+        raise ImportError(
+            "google-generativeai package not installed. Install with: pip install google-generativeai"
+        )
+    gen_model = _google_model(cfg.google_api_key, model)
+    # response_mime_type pins Gemini to raw JSON output.
+    response = await gen_model.generate_content_async(
+        prompt,
+        generation_config={
+            "response_mime_type": "application/json",
+            "temperature": 0.3,
+            "max_output_tokens": _MAX_OUTPUT_TOKENS,
+        },
+    )
+    return response.text
+
+
+async def _call_perplexity(cfg: Config, prompt: str, model: str) -> str:
+    client = _openai_client(cfg.perplexity_api_key, base_url="https://api.perplexity.ai")
+    response = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": _SYSTEM_MESSAGE},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.3,
+        max_tokens=_MAX_OUTPUT_TOKENS,
     )
+    return response.choices[0].message.content or ""
+
+
+_BACKENDS: dict[str, BackendSpec] = {
+    "openai": BackendSpec(
+        "openai", "OpenAI", "openai_api_key", "OPENAI_API_KEY", "openai_model", _call_openai
+    ),
+    "claude": BackendSpec(
+        "claude", "Claude", "claude_api_key", "CLAUDE_API_KEY", "claude_model",
+        _call_claude, strict_retry=True,
+    ),
+    "google": BackendSpec(
+        "google", "Google Gemini", "google_api_key", "GOOGLE_API_KEY", "google_model", _call_google
+    ),
+    "perplexity": BackendSpec(
+        "perplexity", "Perplexity", "perplexity_api_key", "PERPLEXITY_API_KEY", "perplexity_model",
+        _call_perplexity, strict_retry=True,
+    ),
+}
+
+
+async def _analyze_via(
+    spec: BackendSpec,
+    articles: list[Article],
+    market: MarketData,
+    cfg: Config,
+) -> AnalysisResult:
+    """Run one provider through the shared key-check/cache/retry/parse path."""
+    if not getattr(cfg, spec.key_field):
+        raise ValueError(f"No {spec.key_env} set")
+
+    model = getattr(cfg, spec.model_field)
+    prompt = _build_prompt(articles, market, cfg)
+    cached = _disk_cache_get(cfg, prompt, spec.provider, model)
+    if cached is not None:
+        return _parse_analysis(cached)
+
+    last_exc: Exception = ValueError(f"{spec.name} analysis failed")
     for attempt in range(2):
-        prompt_fn = _build_prompt if attempt == 0 else _build_strict_retry_prompt
-        prompt = prompt_fn(articles, market, cfg)
         try:
-            logger.info("Calling Google Gemini (%s), attempt %d", cfg.google_model, attempt + 1)
-            response = model.generate_content(
-                prompt,
-                generation_config={"temperature": 0.3, "max_output_tokens": 1024},
-            )
-            raw = response.text
+            logger.info("Calling %s (%s), attempt %d", spec.name, model, attempt + 1)
+            raw = await spec.call(cfg, prompt, model)
+            # Guarded so the slice isn't materialized when debug is off.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw %s response: %s", spec.name, raw[:500])
             result = _parse_analysis(raw)
-            result = _apply_confidence_threshold(result, cfg.confidence_threshold)
-            logger.info("Google: sentiment=%s, bias=%s, confidence=%d",
-                        result.news_sentiment, result.directional_bias, result.confidence_0_100)
+            _disk_cache_put(cfg, prompt, spec.provider, model, raw)
             return result
         except json.JSONDecodeError as exc:
-            logger.warning("Google JSON parse failed (attempt %d): %s", attempt + 1, exc)
+            logger.warning("%s JSON parse failed (attempt %d): %s", spec.name, attempt + 1, exc)
+            last_exc = exc
+            if spec.strict_retry:
+                prompt = _build_strict_retry_prompt(articles, market, cfg)
+        except (ImportError, *_FATAL_ERRORS) as exc:
+            logger.error("%s fatal error, not retrying: %s", spec.name, exc)
+            raise
+        except _TRANSIENT_ERRORS as exc:
+            logger.warning("%s transient error (attempt %d): %s", spec.name, attempt + 1, exc)
+            last_exc = exc
+            if attempt == 0:
+                await asyncio.sleep(_backoff_delay(attempt))
         except Exception as exc:
-            logger.error("Google API error (attempt %d): %s", attempt + 1, exc)
+            logger.error("%s API error (attempt %d): %s", spec.name, attempt + 1, exc)
+            last_exc = exc
 
-    return _rule_based_fallback(articles, market)
+    raise last_exc
 
 
-def _analyze_perplexity(articles: list[Article], market: MarketData, cfg: Config) -> AnalysisResult:
-    """Analyze using Perplexity API (OpenAI-compatible endpoint)."""
-    if not cfg.perplexity_api_key:
-        logger.warning("No PERPLEXITY_API_KEY set, using rule-based fallback")
-        return _rule_based_fallback(articles, market)
+def _configured_providers(cfg: Config) -> list[str]:
+    """Return the providers that have an API key configured."""
+    return [name for name, spec in _BACKENDS.items() if getattr(cfg, spec.key_field)]
+
+
+# ---------------------------------------------------------------------------
+# In-process result cache
+#
+# Repeated polls with unchanged headlines + market snapshot would otherwise
+# pay a full LLM round-trip for an identical answer. Entries expire after
+# cfg.analysis_cache_ttl seconds; the cache is bounded LRU.
+# ---------------------------------------------------------------------------
+
+_CACHE_MAX_ENTRIES = 256
+_cache: OrderedDict[str, tuple[float, AnalysisResult]] = OrderedDict()
+
+
+def _cache_key(articles: list[Article], market: MarketData, cfg: Config, provider: str) -> str:
+    """Stable hash over the inputs that determine the analysis output.
 
-    client = OpenAI(
-        api_key=cfg.perplexity_api_key,
-        base_url="https://api.perplexity.ai",
+    ``topic`` is part of the payload because it feeds the prompt via
+    _build_prompt; the confidence threshold is deliberately NOT keyed —
+    entries store the pre-threshold result and the threshold is applied
+    on every return.
+    """
+    spec = _BACKENDS.get(provider, _BACKENDS["openai"])
+    model = getattr(cfg, spec.model_field, "")
+    payload = json.dumps(
+        [sorted(a.url for a in articles[:30]), market.to_dict(), provider, model, cfg.topic],
+        sort_keys=True,
+        default=str,
     )
-    for attempt in range(2):
-        prompt_fn = _build_prompt if attempt == 0 else _build_strict_retry_prompt
-        prompt = prompt_fn(articles, market, cfg)
-        try:
-            logger.info("Calling Perplexity (%s), attempt %d", cfg.perplexity_model, attempt + 1)
-            response = client.chat.completions.create(
-                model=cfg.perplexity_model,
-                messages=[
-                    {"role": "system", "content": "You are a financial analyst. Respond only with valid JSON."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.3,
-                max_tokens=1000,
-            )
-            raw = response.choices[0].message.content or ""
-            result = _parse_analysis(raw)
-            result = _apply_confidence_threshold(result, cfg.confidence_threshold)
-            logger.info("Perplexity: sentiment=%s, bias=%s, confidence=%d",
-                        result.news_sentiment, result.directional_bias, result.confidence_0_100)
-            return result
-        except json.JSONDecodeError as exc:
-            logger.warning("Perplexity JSON parse failed (attempt %d): %s", attempt + 1, exc)
-        except Exception as exc:
-            logger.error("Perplexity API error (attempt %d): %s", attempt + 1, exc)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _cache_get(key: str, ttl: int) -> AnalysisResult | None:
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    stored_at, result = entry
+    if time.time() - stored_at > ttl:
+        del _cache[key]
+        return None
+    _cache.move_to_end(key)
+    return result
 
-    return _rule_based_fallback(articles, market)
+
+def _cache_put(key: str, result: AnalysisResult) -> None:
+    _cache[key] = (time.time(), result)
+    _cache.move_to_end(key)
+    while len(_cache) > _CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
 
 
 # ---------------------------------------------------------------------------
 # Public interface — dispatches to the selected provider
 # ---------------------------------------------------------------------------
 
-def analyze(
+async def analyze_async(
     articles: list[Article],
     market: MarketData,
     cfg: Config,
 ) -> AnalysisResult:
-    """Run AI analysis using the configured provider. Falls back to rules on failure."""
+    """Run AI analysis using the configured provider. Falls back to rules on failure.
+
+    ``AI_PROVIDER=ensemble`` runs every configured provider and keeps the
+    highest-confidence result; ``AI_PROVIDER=race`` returns the fastest.
+    Both strategies manage their own provider set, so they bypass the
+    single-provider result cache.
+    """
     provider = cfg.ai_provider.lower()
     logger.info("AI provider: %s", provider)
 
-    if provider == "claude":
-        return _analyze_claude(articles, market, cfg)
-    elif provider == "google":
-        return _analyze_google(articles, market, cfg)
-    elif provider == "perplexity":
-        return _analyze_perplexity(articles, market, cfg)
-    else:
-        # Default: OpenAI
-        return _analyze_openai(articles, market, cfg)
+    if provider == "ensemble":
+        return await analyze_ensemble(articles, market, cfg)
+    if provider == "race":
+        return await analyze_race(articles, market, cfg)
+
+    key = ""
+    if cfg.enable_analysis_cache:
+        key = _cache_key(articles, market, cfg, provider)
+        cached = _cache_get(key, cfg.analysis_cache_ttl)
+        if cached is not None:
+            logger.info("Analysis cache hit for provider %s", provider)
+            return _apply_confidence_threshold(cached, cfg.confidence_threshold)
+
+    spec = _BACKENDS.get(provider, _BACKENDS["openai"])
+    try:
+        result = await _analyze_via(spec, articles, market, cfg)
+    except Exception as exc:
+        logger.warning("Provider %s failed: %s", provider, exc)
+        return _rule_based_fallback(articles, market)
+
+    # Cache the raw provider result; the threshold is applied per call so
+    # callers varying cfg.confidence_threshold within the TTL stay correct.
+    if cfg.enable_analysis_cache:
+        _cache_put(key, result)
+    return _apply_confidence_threshold(result, cfg.confidence_threshold)
+
+
+async def analyze_ensemble(
+    articles: list[Article],
+    market: MarketData,
+    cfg: Config,
+) -> AnalysisResult:
+    """Run all providers with configured keys concurrently and pick a winner.
+
+    All calls run in parallel via asyncio.gather, so wall time is roughly the
+    slowest provider rather than the sum. The highest-confidence successful
+    result wins; if every provider fails, fall back to rules.
+    """
+    providers = _configured_providers(cfg)
+    if not providers:
+        logger.warning("No provider API keys configured, using rule-based fallback")
+        return _rule_based_fallback(articles, market)
+
+    logger.info("Ensemble analysis across providers: %s", ", ".join(providers))
+    outcomes = await asyncio.gather(
+        *(_analyze_via(_BACKENDS[name], articles, market, cfg) for name in providers),
+        return_exceptions=True,
+    )
+
+    results: list[AnalysisResult] = []
+    for name, outcome in zip(providers, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.warning("Provider %s failed: %s", name, outcome)
+        else:
+            results.append(outcome)
+
+    if not results:
+        return _rule_based_fallback(articles, market)
+
+    best = max(results, key=lambda r: r.confidence_0_100)
+    return _apply_confidence_threshold(best, cfg.confidence_threshold)
+
+
+async def analyze_race(
+    articles: list[Article],
+    market: MarketData,
+    cfg: Config,
+) -> AnalysisResult:
+    """Race all configured providers and return the first successful result.
+
+    Unlike :func:`analyze_ensemble` (which waits for every provider), this
+    resolves as soon as the fastest provider produces a parseable result and
+    cancels the rest, so latency equals the fastest responder. Falls back to
+    rules if every provider fails.
+    """
+    providers = _configured_providers(cfg)
+    if not providers:
+        logger.warning("No provider API keys configured, using rule-based fallback")
+        return _rule_based_fallback(articles, market)
+
+    logger.info("Racing providers: %s", ", ".join(providers))
+    tasks = {
+        asyncio.create_task(_analyze_via(_BACKENDS[name], articles, market, cfg), name=name)
+        for name in providers
+    }
+    try:
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    logger.warning("Provider %s failed: %s", task.get_name(), task.exception())
+                    continue
+                logger.info("Provider %s won the race", task.get_name())
+                return _apply_confidence_threshold(task.result(), cfg.confidence_threshold)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return _rule_based_fallback(articles, market)
+
+
+def analyze(
+    articles: list[Article],
+    market: MarketData,
+    cfg: Config,
+) -> AnalysisResult:
+    """Synchronous wrapper around :func:`analyze_async` for CLI/script callers."""
+    return asyncio.run(analyze_async(articles, market, cfg))
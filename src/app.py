@@ -1,15 +1,24 @@
 """Streamlit UI — Finance Signal Pro."""
 from __future__ import annotations
 
-import io
-from datetime import date, timedelta, datetime
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from datetime import date, timedelta
+from typing import Final
 
 import pandas as pd
+import pyarrow as pa
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 from src.utils import Config, DISCLAIMER
+from src.ai_analyze import analyze
 from src.main import run_pipeline
-from src.history import load_history, append_signal_record
+from src.market import fetch_market_data
+from src.news import fetch_news
+from src.history import _HISTORY_FILE, load_history, append_signal_record
 
 # ── Page config ───────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -19,32 +28,35 @@ st.set_page_config(
 )
 
 # ── Signal helpers ────────────────────────────────────────────────────────────
-_SIGNAL_COLORS = {
-    "high_conviction_up":   "#00c853",
-    "likely_up":            "#4caf50",
-    "uncertain":            "#ff9800",
-    "likely_down":          "#f44336",
-    "high_conviction_down": "#b71c1c",
+# One mapping (color, banner label, short label) per signal, so render loops
+# do a single dict probe instead of three.
+_SIGNAL_META: Final[dict[str, tuple[str, str, str]]] = {
+    "high_conviction_up":   ("#00c853", "HIGH CONVICTION UP ▲▲",   "HIGH CONVICTION UP"),
+    "likely_up":            ("#4caf50", "LIKELY UP ▲",             "LIKELY UP"),
+    "uncertain":            ("#ff9800", "UNCERTAIN —",             "UNCERTAIN"),
+    "likely_down":          ("#f44336", "LIKELY DOWN ▼",           "LIKELY DOWN"),
+    "high_conviction_down": ("#b71c1c", "HIGH CONVICTION DOWN ▼▼", "HIGH CONVICTION DOWN"),
 }
-_SIGNAL_LABELS = {
-    "high_conviction_up":   "HIGH CONVICTION UP ▲▲",
-    "likely_up":            "LIKELY UP ▲",
-    "uncertain":            "UNCERTAIN —",
-    "likely_down":          "LIKELY DOWN ▼",
-    "high_conviction_down": "HIGH CONVICTION DOWN ▼▼",
-}
-_SIGNAL_LABELS_SHORT = {
-    "high_conviction_up":   "HIGH CONVICTION UP",
-    "likely_up":            "LIKELY UP",
-    "uncertain":            "UNCERTAIN",
-    "likely_down":          "LIKELY DOWN",
-    "high_conviction_down": "HIGH CONVICTION DOWN",
+# Flat signal→short-label view, kept for vectorized Series.map use.
+_SIGNAL_LABELS_SHORT: Final[dict[str, str]] = {
+    sig: meta[2] for sig, meta in _SIGNAL_META.items()
 }
 
 
+# ── Cached Config template ────────────────────────────────────────────────────
+@st.cache_resource(show_spinner=False)
+def _cfg_template() -> Config:
+    """One env-parsed Config per process; per-ticker variants come via replace."""
+    return Config()
+
+
 # ── Session state init (runs once per browser session) ────────────────────────
 def _init_session() -> None:
-    _env = Config()
+    # Cheap guard first: after the first script run every rerun exits on a
+    # single membership probe instead of rebuilding Config() and the dict.
+    if "results" in st.session_state:
+        return
+    _env = _cfg_template()
     defaults: dict = {
         "tickers":              ["MSFT"],
         "ticker_checked":       {"MSFT": True},
@@ -62,30 +74,170 @@ def _init_session() -> None:
         "results":              {},
     }
     for k, v in defaults.items():
-        if k not in st.session_state:
-            st.session_state[k] = v
+        # Single atomic probe+insert instead of a membership test plus a write.
+        st.session_state.setdefault(k, v)
 
 
 _init_session()
 
 
+# ── Cached Arrow conversion ───────────────────────────────────────────────────
+@st.cache_data(show_spinner=False)
+def _indicators_df(m: dict) -> pd.DataFrame:
+    """Formatted indicator table for one market snapshot, memoized by content.
+
+    Tab switches and widget interactions rerun the detail expanders; caching
+    on the market dict skips rebuilding identical formatted strings.
+    """
+    return pd.DataFrame({
+        "Indicator": [
+            "Last Close", "SMA-7", "SMA-21", "Close vs SMA-7",
+            "7-Day Return", "RSI-14",
+            "BB Upper (20)", "BB Middle (20)", "BB Lower (20)", "BB Position",
+            "10-Day Avg Volume", "Volume vs Avg",
+        ],
+        "Value": [
+            f"${m['last_close']:,.2f}  ({m['last_close_date']})",
+            f"${m['sma_7']:,.2f}",
+            f"${m['sma_21']:,.2f}",
+            m["close_vs_sma7"].upper(),
+            f"{m['return_7d_pct']:+.2f}%",
+            f"{m['rsi_14']:.1f}" + (
+                "  ← overbought" if m["rsi_14"] > 70
+                else "  ← oversold" if m["rsi_14"] < 30 else ""
+            ),
+            f"${m['bb_upper']:,.2f}",
+            f"${m['bb_middle']:,.2f}",
+            f"${m['bb_lower']:,.2f}",
+            m["bb_position"].replace("_", " ").upper(),
+            f"{m['vol_10d_avg']:,.0f}",
+            m["vol_vs_avg"].upper(),
+        ],
+    })
+
+
+@st.cache_data(show_spinner=False)
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    """Memoized CSV serialization for the export button.
+
+    Returning bytes also spares Streamlit the str→bytes copy it would do
+    internally on download.
+    """
+    return df.to_csv(index=False).encode("utf-8")
+
+
+@st.cache_data(show_spinner=False)
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    """Memoized pandas→Arrow conversion for st.dataframe.
+
+    Streamlit otherwise re-runs Table.from_pandas on every rerun; passing a
+    ready Table lets it skip that. pyarrow is a hard Streamlit dependency, so
+    the import is unconditional.
+    """
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+# ── Cached history loader ─────────────────────────────────────────────────────
+@st.cache_data(show_spinner=False)
+def _cached_history(mtime: float) -> list[dict]:
+    """Memoized history load; ``mtime`` keys the cache so appends invalidate it."""
+    return load_history(_cfg_template())
+
+
+def _load_history_cached(cfg: Config) -> list[dict]:
+    history_path = cfg.data_dir / _HISTORY_FILE
+    mtime = history_path.stat().st_mtime if history_path.exists() else 0.0
+    return _cached_history(mtime)
+
+
 # ── Config builder ────────────────────────────────────────────────────────────
 def _build_cfg(ticker: str) -> Config:
-    cfg = Config()
-    cfg.ticker               = ticker
-    cfg.topic                = ticker
-    cfg.ai_provider          = st.session_state["ai_provider"]
-    cfg.openai_api_key       = st.session_state["openai_key"]
-    cfg.openai_model         = st.session_state["openai_model"]
-    cfg.claude_api_key       = st.session_state["claude_key"]
-    cfg.claude_model         = st.session_state["claude_model"]
-    cfg.google_api_key       = st.session_state["google_key"]
-    cfg.google_model         = st.session_state["google_model"]
-    cfg.perplexity_api_key   = st.session_state["perplexity_key"]
-    cfg.perplexity_model     = st.session_state["perplexity_model"]
-    cfg.confidence_threshold = st.session_state["confidence_threshold"]
-    cfg.newsapi_key          = st.session_state["newsapi_key"]
-    return cfg
+    # dataclasses.replace re-runs __post_init__, so the derived data_dir is
+    # still set; everything else is copied without re-reading env vars.
+    return replace(
+        _cfg_template(),
+        ticker=ticker,
+        topic=ticker,
+        ai_provider=st.session_state["ai_provider"],
+        openai_api_key=st.session_state["openai_key"],
+        openai_model=st.session_state["openai_model"],
+        claude_api_key=st.session_state["claude_key"],
+        claude_model=st.session_state["claude_model"],
+        google_api_key=st.session_state["google_key"],
+        google_model=st.session_state["google_model"],
+        perplexity_api_key=st.session_state["perplexity_key"],
+        perplexity_model=st.session_state["perplexity_model"],
+        confidence_threshold=st.session_state["confidence_threshold"],
+        newsapi_key=st.session_state["newsapi_key"],
+    )
+
+
+# ── Cached fetchers ───────────────────────────────────────────────────────────
+# Config is unhashable, so these are keyed on the primitive fields that affect
+# the fetch and rebuild a per-call Config from the cached template.
+@st.cache_data(ttl=900, show_spinner=False)
+def _cached_news(topic: str, newsapi_key: str) -> list:
+    """News fetch memoized for 15 min per (topic, key)."""
+    return fetch_news(replace(_cfg_template(), topic=topic, newsapi_key=newsapi_key))
+
+
+@st.cache_data(persist="disk", ttl=86400, max_entries=500, show_spinner=False)
+def _cached_market(ticker: str, as_of: str):
+    """Market fetch persisted to disk, keyed by (ticker, calendar day).
+
+    Closed-day OHLC never changes, so entries survive Streamlit restarts;
+    the ``as_of`` key forces a fresh fetch on the first run of each day.
+    """
+    return fetch_market_data(replace(_cfg_template(), ticker=ticker))
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _cached_analyze(content_key: str, _articles: list, _market, _cfg: Config):
+    """LLM analysis memoized by content hash.
+
+    The underscore-prefixed args are excluded from Streamlit's cache key;
+    ``content_key`` alone decides hits, so identical headlines + market date
+    + model skip the API call entirely.
+    """
+    return analyze(_articles, _market, _cfg)
+
+
+def _analyze_cached(articles: list, market, cfg: Config):
+    # The active API key is part of the key: a run with a missing/bad key
+    # caches the rule-based fallback, so fixing the key must miss here too,
+    # not just in the outer pipeline cache. The threshold is part of the key
+    # because analyze() applies it before the result is cached.
+    model = getattr(cfg, f"{cfg.ai_provider}_model", cfg.openai_model)
+    api_key = getattr(cfg, f"{cfg.ai_provider}_api_key", cfg.openai_api_key)
+    raw = "|".join(sorted(a.url for a in articles)) + \
+        f"|{market.last_close_date}|{cfg.ai_provider}|{model}" \
+        f"|{cfg.confidence_threshold}|{api_key}"
+    return _cached_analyze(hashlib.sha256(raw.encode()).hexdigest(), articles, market, cfg)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_pipeline(
+    ticker: str,
+    provider: str,
+    model: str,
+    confidence_threshold: int,
+    newsapi_key: str,
+    api_key_hash: str,
+) -> tuple:
+    """Memoized pipeline run keyed on the knobs that change its output.
+
+    Re-clicking Run for the same ticker/provider/model within the TTL is a
+    memory read instead of repeating 5-30s of news + LLM calls. The result
+    also depends on the active provider's API key — a missing key caches
+    the rule-based fallback — so a hash of it is part of the key and fixing
+    the key in the sidebar invalidates the stale entry immediately.
+    """
+    return run_pipeline(
+        _build_cfg(ticker),
+        fetch_news_fn=lambda cfg: _cached_news(cfg.topic, cfg.newsapi_key),
+        fetch_market_fn=lambda cfg: _cached_market(cfg.ticker, date.today().isoformat()),
+        analyze_fn=_analyze_cached,
+    )
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -168,59 +320,72 @@ with st.sidebar:
 
     # ── Ticker List ───────────────────────────────────────────────────────────
     st.divider()
-    st.markdown("#### Ticker List")
-
-    # Add input
-    _add_col, _btn_col = st.columns([3, 1])
-    with _add_col:
-        _new_t = st.text_input(
-            "ticker", key="new_ticker_input",
-            label_visibility="collapsed",
-            placeholder="e.g. AAPL",
-        )
-    with _btn_col:
-        st.write("")  # vertical align
-        if st.button("Add", use_container_width=True, key="btn_add_ticker"):
-            _t = _new_t.strip().upper()
-            if _t and _t not in st.session_state["tickers"]:
-                st.session_state["tickers"].append(_t)
-                st.session_state["ticker_checked"][_t] = True
-                st.rerun()
-
-    # Select all / none
-    _sa, _sn = st.columns(2)
-    with _sa:
-        if st.button("✓ All", use_container_width=True):
-            for _t in st.session_state["tickers"]:
-                st.session_state["ticker_checked"][_t] = True
-            st.rerun()
-    with _sn:
-        if st.button("○ None", use_container_width=True):
-            for _t in st.session_state["tickers"]:
-                st.session_state["ticker_checked"][_t] = False
-            st.rerun()
-
-    # Ticker rows: checkbox + remove button
-    _to_remove: list[str] = []
-    for _t in list(st.session_state["tickers"]):
-        _chk_col, _rm_col = st.columns([5, 1])
-        with _chk_col:
-            _checked = st.checkbox(
-                _t,
-                value=st.session_state["ticker_checked"].get(_t, True),
-                key=f"chk_{_t}",
+
+    # Fragment-scoped: Add/All/None/remove clicks rerun only this block, not
+    # the whole script (history load, results tabs, Arrow re-encoding).
+    @st.fragment
+    def _ticker_list_fragment() -> None:
+        st.markdown("#### Ticker List")
+
+        # Add input
+        _add_col, _btn_col = st.columns([3, 1])
+        with _add_col:
+            _new_t = st.text_input(
+                "ticker", key="new_ticker_input",
+                label_visibility="collapsed",
+                placeholder="e.g. AAPL",
             )
-            st.session_state["ticker_checked"][_t] = _checked
-        with _rm_col:
-            if st.button("✕", key=f"rm_{_t}", help=f"Remove {_t}"):
-                _to_remove.append(_t)
-
-    if _to_remove:
-        for _t in _to_remove:
-            st.session_state["tickers"].remove(_t)
-            st.session_state["ticker_checked"].pop(_t, None)
-            st.session_state["results"].pop(_t, None)
-        st.rerun()
+        with _btn_col:
+            st.write("")  # vertical align
+            if st.button("Add", use_container_width=True, key="btn_add_ticker"):
+                _t = _new_t.strip().upper()
+                if _t and _t not in st.session_state["tickers"]:
+                    st.session_state["tickers"].append(_t)
+                    st.session_state["ticker_checked"][_t] = True
+
+        # Select all / none (mutations land before the checkbox rows render,
+        # so no explicit rerun is needed)
+        _sa, _sn = st.columns(2)
+        with _sa:
+            if st.button("✓ All", use_container_width=True):
+                for _t in st.session_state["tickers"]:
+                    st.session_state["ticker_checked"][_t] = True
+        with _sn:
+            if st.button("○ None", use_container_width=True):
+                for _t in st.session_state["tickers"]:
+                    st.session_state["ticker_checked"][_t] = False
+
+        # Ticker rows: checkbox + remove button
+        _to_remove: list[str] = []
+        for _t in list(st.session_state["tickers"]):
+            _chk_col, _rm_col = st.columns([5, 1])
+            with _chk_col:
+                st.checkbox(
+                    _t,
+                    value=st.session_state["ticker_checked"].get(_t, True),
+                    key=f"chk_{_t}",
+                )
+            with _rm_col:
+                if st.button("✕", key=f"rm_{_t}", help=f"Remove {_t}"):
+                    _to_remove.append(_t)
+
+        # Commit all checkbox states in one pass instead of a session_state
+        # write per row.
+        st.session_state["ticker_checked"] = {
+            _t: st.session_state.get(f"chk_{_t}", True)
+            for _t in st.session_state["tickers"]
+        }
+
+        if _to_remove:
+            for _t in _to_remove:
+                st.session_state["tickers"].remove(_t)
+                st.session_state["ticker_checked"].pop(_t, None)
+                st.session_state["results"].pop(_t, None)
+            # The removed rows were already rendered this pass; redraw the
+            # fragment only.
+            st.rerun(scope="fragment")
+
+    _ticker_list_fragment()
 
     st.divider()
     _run_clicked = st.button(
@@ -259,32 +424,63 @@ if _run_clicked:
             st.error("\n".join(_problems))
         else:
             _prog = st.progress(0, text="Starting analysis…")
-            for _i, _ticker in enumerate(_selected):
-                _prog.progress(
-                    _i / len(_selected),
-                    text=f"Analyzing {_ticker}… ({_i + 1}/{len(_selected)})",
+
+            def _run_one(cfg: Config) -> dict:
+                _api_key = getattr(cfg, f"{cfg.ai_provider}_api_key", cfg.openai_api_key)
+                _articles, _market, _ai, _signal, _report = _cached_pipeline(
+                    cfg.ticker,
+                    cfg.ai_provider,
+                    getattr(cfg, f"{cfg.ai_provider}_model", cfg.openai_model),
+                    cfg.confidence_threshold,
+                    cfg.newsapi_key,
+                    hashlib.sha256(_api_key.encode()).hexdigest(),
                 )
-                _cfg = _build_cfg(_ticker)
-                try:
-                    _articles, _market, _ai, _signal, _report = run_pipeline(_cfg)
-                    append_signal_record(_cfg, _market, _ai, _signal)
-                    st.session_state["results"][_ticker] = {
-                        "articles":     _articles,
-                        "market":       _market,
-                        "ai":           _ai,
-                        "final_signal": _signal,
-                        "report":       _report,
-                        "error":        None,
-                    }
-                except Exception as _exc:
-                    st.session_state["results"][_ticker] = {"error": str(_exc)}
+                append_signal_record(cfg, _market, _ai, _signal)
+                return {
+                    "articles":     _articles,
+                    "market":       _market,
+                    "ai":           _ai,
+                    "final_signal": _signal,
+                    "report":       _report,
+                    "error":        None,
+                }
+
+            # Each ticker is dominated by news/LLM/network I/O, so run them
+            # concurrently; worker threads need the Streamlit script context
+            # attached to touch st.* safely. Attach it inside the submitted
+            # callable — decorating the pool's threads after submission races
+            # workers that may already be inside _run_one.
+            _ctx = get_script_run_ctx()
+
+            def _run_one_with_ctx(cfg: Config) -> dict:
+                add_script_run_ctx(threading.current_thread(), _ctx)
+                return _run_one(cfg)
+
+            with ThreadPoolExecutor(max_workers=min(8, len(_selected))) as _ex:
+                _futures = {
+                    _ex.submit(_run_one_with_ctx, _build_cfg(_t)): _t for _t in _selected
+                }
+                for _done, _fut in enumerate(as_completed(_futures), start=1):
+                    _ticker = _futures[_fut]
+                    try:
+                        st.session_state["results"][_ticker] = _fut.result()
+                    except Exception as _exc:
+                        st.session_state["results"][_ticker] = {"error": str(_exc)}
+                    _prog.progress(
+                        _done / len(_selected),
+                        text=f"Analyzed {_ticker} ({_done}/{len(_selected)})",
+                    )
 
             _prog.progress(1.0, text=f"Done — {len(_selected)} ticker(s) analyzed.")
 
 # ─────────────────────────────────────────────────────────────────────────────
 # TAB 1 — CURRENT SESSION
 # ─────────────────────────────────────────────────────────────────────────────
-with _tab_session:
+# Fragment-scoped: sidebar widget interactions (API key typing, slider
+# drags) rerun only this panel's owner fragment, not the ~100 lines of
+# banner/metric/table building below.
+@st.fragment
+def _render_results() -> None:
     _results = st.session_state["results"]
 
     if not _results:
@@ -293,158 +489,155 @@ with _tab_session:
             "then click **▶ Run Selected Tickers**."
         )
         st.warning(DISCLAIMER)
-    else:
-        # ── Summary grid ──────────────────────────────────────────────────────
-        st.subheader("Results Summary")
+        return
+    # ── Summary grid (placeholder, filled after the single pass below) ────
+    st.subheader("Results Summary")
+    _summary_slot = st.empty()
 
-        _summary_rows = []
-        for _tk, _r in _results.items():
+    st.divider()
+
+    # ── Per-ticker detail ─────────────────────────────────────────────────
+    st.subheader("Ticker Details")
+
+    # One pass over _results builds the summary columns (SoA: pandas gets
+    # typed columns directly) while rendering each detail expander; the
+    # placeholder above is filled once the columns are complete.
+    _col_ticker: list[str] = []
+    _col_signal: list[str] = []
+    _col_conf:   list[object] = []
+    _col_sent:   list[str] = []
+    _col_close:  list[str] = []
+    _col_ret7:   list[str] = []
+    _col_rsi:    list[str] = []
+    _col_sma7:   list[str] = []
+    _col_bb:     list[str] = []
+
+    for _tk, _r in _results.items():
+        _col_ticker.append(_tk)
+        with st.expander(f"**{_tk}**", expanded=len(_results) == 1):
             if _r.get("error"):
-                _summary_rows.append({
-                    "Ticker":    _tk,
-                    "Signal":    "ERROR",
-                    "Conf":      "—",
-                    "Sentiment": "—",
-                    "Close":     "—",
-                    "7d Return": "—",
-                    "RSI-14":    "—",
-                    "vs SMA-7":  "—",
-                    "BB Position": "—",
-                })
-            else:
-                _m  = _r["market"]
-                _ai = _r["ai"]
-                _summary_rows.append({
-                    "Ticker":      _tk,
-                    "Signal":      _SIGNAL_LABELS_SHORT.get(_r["final_signal"], _r["final_signal"].upper()),
-                    "Conf":        _ai.confidence_0_100,
-                    "Sentiment":   _ai.news_sentiment.upper(),
-                    "Close":       f"${_m.last_close:,.2f}",
-                    "7d Return":   f"{_m.return_7d_pct:+.2f}%",
-                    "RSI-14":      f"{_m.rsi_14:.1f}",
-                    "vs SMA-7":    _m.close_vs_sma7.upper(),
-                    "BB Position": _m.bb_position.replace("_", " ").upper(),
-                })
-
-        _summary_df = pd.DataFrame(_summary_rows)
-        st.dataframe(_summary_df, use_container_width=True, hide_index=True)
-
-        st.divider()
-
-        # ── Per-ticker detail ─────────────────────────────────────────────────
-        st.subheader("Ticker Details")
-
-        for _tk, _r in _results.items():
-            with st.expander(f"**{_tk}**", expanded=len(_results) == 1):
-                if _r.get("error"):
-                    st.error(_r["error"])
-                    continue
-
-                _m      = _r["market"]
-                _ai     = _r["ai"]
-                _arts   = _r["articles"]
-                _sig    = _r["final_signal"]
-                _report = _r["report"]
-
-                # Signal banner
-                _color = _SIGNAL_COLORS.get(_sig, "#888")
-                _label = _SIGNAL_LABELS.get(_sig, _sig.upper())
-                st.markdown(
-                    f'<div style="background:{_color};padding:16px 20px;border-radius:8px;'
-                    f'text-align:center;margin-bottom:12px;">'
-                    f'<h2 style="color:white;margin:0;font-size:1.8em;">{_label}</h2>'
-                    f'<p style="color:rgba(255,255,255,0.85);margin:4px 0 0 0;">{_tk}</p>'
-                    f"</div>",
-                    unsafe_allow_html=True,
-                )
+                _col_signal.append("ERROR")
+                _col_conf.append("—")
+                _col_sent.append("—")
+                _col_close.append("—")
+                _col_ret7.append("—")
+                _col_rsi.append("—")
+                _col_sma7.append("—")
+                _col_bb.append("—")
+                st.error(_r["error"])
+                continue
 
-                # Key metrics
-                _c1, _c2, _c3, _c4 = st.columns(4)
-                _c1.metric(
-                    "Last Close",
-                    f"${_m.last_close:,.2f}",
-                    delta=f"{_m.return_7d_pct:+.2f}% (7d)",
-                )
-                _c2.metric(
-                    "RSI-14",
-                    f"{_m.rsi_14:.1f}",
-                    delta="overbought" if _m.rsi_14 > 70 else ("oversold" if _m.rsi_14 < 30 else None),
-                )
-                _c3.metric("AI Confidence", f"{_ai.confidence_0_100}/100")
-                _c4.metric("vs SMA-7", _m.close_vs_sma7.upper())
+            _m      = _r["market"]
+            _ai     = _r["ai"]
+            _arts   = _r["articles"]
+            _sig    = _r["final_signal"]
+            _report = _r["report"]
+
+            _col_signal.append(_SIGNAL_LABELS_SHORT.get(_sig, _sig.upper()))
+            _col_conf.append(_ai.confidence_0_100)
+            _col_sent.append(_ai.news_sentiment.upper())
+            _col_close.append(f"${_m.last_close:,.2f}")
+            _col_ret7.append(f"{_m.return_7d_pct:+.2f}%")
+            _col_rsi.append(f"{_m.rsi_14:.1f}")
+            _col_sma7.append(_m.close_vs_sma7.upper())
+            _col_bb.append(_m.bb_position.replace("_", " ").upper())
+
+            # Signal banner
+            _color, _label, _ = _SIGNAL_META.get(_sig, ("#888", _sig.upper(), _sig.upper()))
+            st.markdown(
+                f'<div style="background:{_color};padding:16px 20px;border-radius:8px;'
+                f'text-align:center;margin-bottom:12px;">'
+                f'<h2 style="color:white;margin:0;font-size:1.8em;">{_label}</h2>'
+                f'<p style="color:rgba(255,255,255,0.85);margin:4px 0 0 0;">{_tk}</p>'
+                f"</div>",
+                unsafe_allow_html=True,
+            )
 
-                st.divider()
+            # Key metrics
+            _c1, _c2, _c3, _c4 = st.columns(4)
+            _c1.metric(
+                "Last Close",
+                f"${_m.last_close:,.2f}",
+                delta=f"{_m.return_7d_pct:+.2f}% (7d)",
+            )
+            _c2.metric(
+                "RSI-14",
+                f"{_m.rsi_14:.1f}",
+                delta="overbought" if _m.rsi_14 > 70 else ("oversold" if _m.rsi_14 < 30 else None),
+            )
+            _c3.metric("AI Confidence", f"{_ai.confidence_0_100}/100")
+            _c4.metric("vs SMA-7", _m.close_vs_sma7.upper())
 
-                # AI analysis
-                st.markdown("**AI Analysis**")
-                st.caption(
-                    f"Sentiment: **{_ai.news_sentiment.upper()}**  ·  "
-                    f"Bias: **{_ai.directional_bias}**  ·  "
-                    f"Provider: **{st.session_state['ai_provider'].upper()}**"
-                )
+            st.divider()
 
-                _drv_col, _risk_col = st.columns(2)
-                with _drv_col:
-                    st.markdown("**Key Drivers**")
-                    for _d in (_ai.key_drivers or ["(none)"]):
-                        st.markdown(f"- {_d}")
-                with _risk_col:
-                    st.markdown("**Risk Factors**")
-                    for _rf in (_ai.risk_factors or ["(none)"]):
-                        st.markdown(f"- {_rf}")
-                st.info(_ai.one_paragraph_rationale)
-
-                # Market indicators
-                with st.expander("Full Market Indicators"):
-                    _ind_df = pd.DataFrame({
-                        "Indicator": [
-                            "Last Close", "SMA-7", "SMA-21", "Close vs SMA-7",
-                            "7-Day Return", "RSI-14",
-                            "BB Upper (20)", "BB Middle (20)", "BB Lower (20)", "BB Position",
-                            "10-Day Avg Volume", "Volume vs Avg",
-                        ],
-                        "Value": [
-                            f"${_m.last_close:,.2f}  ({_m.last_close_date})",
-                            f"${_m.sma_7:,.2f}",
-                            f"${_m.sma_21:,.2f}",
-                            _m.close_vs_sma7.upper(),
-                            f"{_m.return_7d_pct:+.2f}%",
-                            f"{_m.rsi_14:.1f}" + (
-                                "  ← overbought" if _m.rsi_14 > 70
-                                else "  ← oversold" if _m.rsi_14 < 30 else ""
-                            ),
-                            f"${_m.bb_upper:,.2f}",
-                            f"${_m.bb_middle:,.2f}",
-                            f"${_m.bb_lower:,.2f}",
-                            _m.bb_position.replace("_", " ").upper(),
-                            f"{_m.vol_10d_avg:,.0f}",
-                            _m.vol_vs_avg.upper(),
-                        ],
-                    })
-                    st.table(_ind_df)
-
-                # News articles
-                with st.expander(f"News Articles ({len(_arts)})"):
-                    if _arts:
-                        for _art in _arts:
-                            st.markdown(
-                                f"**[{_art.title}]({_art.url})**  \n"
-                                f"*{_art.source} — {_art.published}*"
-                            )
-                            if _art.summary:
-                                _preview = _art.summary[:200]
-                                if len(_art.summary) > 200:
-                                    _preview += "…"
-                                st.markdown(f"> {_preview}")
-                            st.markdown("---")
-                    else:
-                        st.info("No articles fetched for this ticker.")
-
-                # Full report
-                with st.expander("Full Text Report"):
-                    st.code(_report, language=None)
+            # AI analysis
+            st.markdown("**AI Analysis**")
+            st.caption(
+                f"Sentiment: **{_ai.news_sentiment.upper()}**  ·  "
+                f"Bias: **{_ai.directional_bias}**  ·  "
+                f"Provider: **{st.session_state['ai_provider'].upper()}**"
+            )
+
+            _drv_col, _risk_col = st.columns(2)
+            with _drv_col:
+                st.markdown("**Key Drivers**")
+                for _d in (_ai.key_drivers or ["(none)"]):
+                    st.markdown(f"- {_d}")
+            with _risk_col:
+                st.markdown("**Risk Factors**")
+                for _rf in (_ai.risk_factors or ["(none)"]):
+                    st.markdown(f"- {_rf}")
+            st.info(_ai.one_paragraph_rationale)
+
+            # Market indicators
+            with st.expander("Full Market Indicators"):
+                st.table(_indicators_df(_m.to_dict()))
+
+            # News articles — one st.markdown for the whole list: each
+            # st.* call is a separate frontend message, so batching cuts
+            # 3-4 messages per article down to one per ticker.
+            with st.expander(f"News Articles ({len(_arts)})"):
+                if _arts:
+                    _blocks = []
+                    for _art in _arts:
+                        _block = (
+                            f"**[{_art.title}]({_art.url})**  \n"
+                            f"*{_art.source} — {_art.published}*"
+                        )
+                        if _art.summary:
+                            _preview = _art.summary[:200]
+                            if len(_art.summary) > 200:
+                                _preview += "…"
+                            _block += f"\n\n> {_preview}"
+                        _blocks.append(_block)
+                    st.markdown("\n\n---\n\n".join(_blocks))
+                else:
+                    st.info("No articles fetched for this ticker.")
+
+            # Full report
+            with st.expander("Full Text Report"):
+                st.code(_report, language=None)
+
+    _summary_df = pd.DataFrame({
+        "Ticker":      _col_ticker,
+        "Signal":      _col_signal,
+        "Conf":        _col_conf,
+        "Sentiment":   _col_sent,
+        "Close":       _col_close,
+        "7d Return":   _col_ret7,
+        "RSI-14":      _col_rsi,
+        "vs SMA-7":    _col_sma7,
+        "BB Position": _col_bb,
+    })
+    _summary_slot.dataframe(
+        _to_arrow(_summary_df), use_container_width=True, hide_index=True
+    )
+
+    st.warning(DISCLAIMER)
 
-        st.warning(DISCLAIMER)
+
+with _tab_session:
+    _render_results()
 
 # ─────────────────────────────────────────────────────────────────────────────
 # TAB 2 — HISTORICAL ANALYSIS
@@ -452,8 +645,8 @@ with _tab_session:
 with _tab_history:
     # Load all records
     try:
-        _hist_cfg    = Config()
-        _all_records = load_history(_hist_cfg)
+        _hist_cfg    = _cfg_template()
+        _all_records = _load_history_cached(_hist_cfg)
     except Exception as _exc:
         st.error(f"Could not load history: {_exc}")
         _all_records = []
@@ -484,75 +677,78 @@ with _tab_history:
             st.write("")
             st.button("Refresh", use_container_width=True, key="hist_refresh")
 
-        # ── Apply filters ─────────────────────────────────────────────────────
-        _filtered: list[dict] = []
-        for _rec in _all_records:
-            _run_at = _rec.get("run_at", "")
-            try:
-                _dt = datetime.fromisoformat(_run_at).date()
-            except Exception:
-                _dt = date.today()
-
-            if _ticker_filter != "All Tickers":
-                if _rec.get("ticker", "").upper() != _ticker_filter.upper():
-                    continue
-            if _dt < _from_date or _dt > _to_date:
-                continue
-            _filtered.append(_rec)
-
-        # ── Build DataFrame ───────────────────────────────────────────────────
-        _hist_rows: list[dict] = []
-        for _rec in _filtered:
-            _run_at = _rec.get("run_at", "")
-            try:
-                _dt_str = datetime.fromisoformat(_run_at).strftime("%Y-%m-%d %H:%M")
-            except Exception:
-                _dt_str = _run_at[:16] if _run_at else "?"
-
-            _close = _rec.get("last_close")
-            _rsi   = _rec.get("rsi_14")
-            _ret7  = _rec.get("return_7d_pct")
-            _sig   = _rec.get("final_signal", "")
-            _sma7  = _rec.get("close_vs_sma7", "")
-            _sent  = _rec.get("news_sentiment", "")
-
-            _hist_rows.append({
-                "Date / Time (UTC)": _dt_str,
-                "Ticker":    _rec.get("ticker", "?"),
-                "Signal":    _SIGNAL_LABELS_SHORT.get(_sig, _sig.upper()),
-                "Conf":      _rec.get("confidence_0_100", "?"),
-                "Sentiment": _sent.upper() if _sent else "?",
-                "Close ($)": f"${_close:.2f}" if isinstance(_close, (int, float)) else "?",
-                "7d Ret %":  f"{_ret7:+.2f}%" if isinstance(_ret7, (int, float)) else "?",
-                "vs SMA-7":  _sma7.upper() if _sma7 else "?",
-                "RSI-14":    f"{_rsi:.1f}" if isinstance(_rsi, (int, float)) else "?",
-            })
-
-        if not _hist_rows:
+        # ── Apply filters (vectorized) ────────────────────────────────────────
+        _df_all = pd.DataFrame(_all_records)
+        for _col in ("run_at", "ticker"):
+            if _col not in _df_all.columns:
+                _df_all[_col] = ""
+
+        # One C-level date parse for the whole column; unparseable timestamps
+        # fall back to today (kept unless the range excludes them), matching
+        # the old per-record behaviour.
+        _dates = (
+            pd.to_datetime(_df_all["run_at"], errors="coerce", utc=True)
+            .dt.date
+            .fillna(date.today())
+        )
+        _mask = (_dates >= _from_date) & (_dates <= _to_date)
+        if _ticker_filter != "All Tickers":
+            _mask &= _df_all["ticker"].fillna("").str.upper() == _ticker_filter.upper()
+
+        _fdf = _df_all[_mask]
+        for _col in (
+            "final_signal", "news_sentiment", "close_vs_sma7",
+            "confidence_0_100", "last_close", "return_7d_pct", "rsi_14",
+        ):
+            if _col not in _fdf.columns:
+                _fdf[_col] = None
+
+        if _fdf.empty:
             st.info("No records match the current filters.")
         else:
-            _hist_df = pd.DataFrame(_hist_rows)
+            # ── Build display DataFrame (vectorized) ──────────────────────────
+            # Each column is one C-level pandas kernel instead of N Python
+            # dict/format calls per record.
+            _run_parsed = pd.to_datetime(_fdf["run_at"], errors="coerce", utc=True)
+            _date_col = _run_parsed.dt.strftime("%Y-%m-%d %H:%M").fillna(
+                _fdf["run_at"].fillna("").astype(str).str.slice(0, 16).replace("", "?")
+            )
+
+            _sig_col = _fdf["final_signal"].fillna("")
+            _close_num = pd.to_numeric(_fdf["last_close"], errors="coerce")
+            _ret7_num  = pd.to_numeric(_fdf["return_7d_pct"], errors="coerce")
+            _rsi_num   = pd.to_numeric(_fdf["rsi_14"], errors="coerce")
+
+            _hist_df = pd.DataFrame({
+                "Date / Time (UTC)": _date_col,
+                "Ticker":    _fdf["ticker"].fillna("?"),
+                "Signal":    _sig_col.map(_SIGNAL_LABELS_SHORT).fillna(_sig_col.str.upper()),
+                "Conf":      _fdf["confidence_0_100"].fillna("?"),
+                "Sentiment": _fdf["news_sentiment"].fillna("").str.upper().replace("", "?"),
+                "Close ($)": _close_num.map("${:.2f}".format).where(_close_num.notna(), "?"),
+                "7d Ret %":  _ret7_num.map("{:+.2f}%".format).where(_ret7_num.notna(), "?"),
+                "vs SMA-7":  _fdf["close_vs_sma7"].fillna("").str.upper().replace("", "?"),
+                "RSI-14":    _rsi_num.map("{:.1f}".format).where(_rsi_num.notna(), "?"),
+            })
 
             # ── Summary stats ─────────────────────────────────────────────────
-            _n_up   = sum(1 for r in _filtered if "up"        in r.get("final_signal", ""))
-            _n_down = sum(1 for r in _filtered if "down"      in r.get("final_signal", ""))
-            _n_unc  = sum(1 for r in _filtered if "uncertain" in r.get("final_signal", ""))
+            _n_up   = int(_sig_col.str.contains("up").sum())
+            _n_down = int(_sig_col.str.contains("down").sum())
+            _n_unc  = int(_sig_col.str.contains("uncertain").sum())
 
             _s1, _s2, _s3, _s4 = st.columns(4)
-            _s1.metric("Total Records", len(_hist_rows))
+            _s1.metric("Total Records", len(_hist_df))
             _s2.metric("Up Signals",       _n_up)
             _s3.metric("Down Signals",     _n_down)
             _s4.metric("Uncertain",        _n_unc)
 
             # ── CSV export ────────────────────────────────────────────────────
-            _csv_buf = io.StringIO()
-            _hist_df.to_csv(_csv_buf, index=False)
             st.download_button(
                 "↓ Export CSV",
-                data=_csv_buf.getvalue(),
+                data=_csv_bytes(_hist_df),
                 file_name=f"signal_history_{date.today()}.csv",
                 mime="text/csv",
             )
 
             # ── Table ─────────────────────────────────────────────────────────
-            st.dataframe(_hist_df, use_container_width=True, hide_index=True)
+            st.dataframe(_to_arrow(_hist_df), use_container_width=True, hide_index=True)
@@ -2,19 +2,46 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
 
 import yfinance as yf
 
+try:  # optional C-accelerated JSON parser
+    import orjson as _orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _orjson = None
+    _HAS_ORJSON = False
+
 from src.market import MarketData
 from src.ai_analyze import AnalysisResult
-from src.utils import Config
+from src.utils import Config, get_config
 
 logger = logging.getLogger("signal.history")
 
 _HISTORY_FILE = "signal_history.jsonl"
+_BACKTEST_CACHE_FILE = "backtest_cache.json"
+
+# Long-running processes (the Streamlit server) append one record per run;
+# keep the file handle open per path instead of reopening it every time.
+_APPEND_HANDLES: dict[str, object] = {}
+
+
+def _history_handle(path):
+    """Return a cached append-mode handle for ``path``, reopening if closed."""
+    key = str(path)
+    fh = _APPEND_HANDLES.get(key)
+    if fh is None or fh.closed:
+        fh = path.open("a", encoding="utf-8")
+        _APPEND_HANDLES[key] = fh
+    return fh
 
 # Signals that express a directional prediction (excluded: "uncertain")
 _BULLISH_SIGNALS = {"likely_up", "high_conviction_up"}
@@ -47,11 +74,16 @@ def append_signal_record(
         "rsi_14": market.rsi_14,
     }
     history_path = cfg.data_dir / _HISTORY_FILE
+    line = (
+        _orjson.dumps(record).decode() if _HAS_ORJSON else json.dumps(record)
+    )
     try:
-        with history_path.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(record) + "\n")
+        fh = _history_handle(history_path)
+        fh.write(line + "\n")
+        fh.flush()
         logger.info("Signal record appended -> %s", history_path)
     except OSError as exc:
+        _APPEND_HANDLES.pop(str(history_path), None)
         logger.warning("Could not write signal history: %s", exc)
 
 
@@ -61,21 +93,39 @@ def load_history(cfg: Config) -> list[dict]:
     Returns an empty list if the file does not exist.
     Skips and warns on malformed lines.
     """
-    history_path = cfg.data_dir / _HISTORY_FILE
+    return _load_history_path(cfg.data_dir / _HISTORY_FILE)
+
+
+def iter_history(cfg: Config) -> Iterator[dict]:
+    """Yield history records one at a time without materializing the file.
+
+    Streaming counterpart of load_history for callers that only scan once;
+    memory stays constant regardless of history size.
+    """
+    yield from _iter_history_path(cfg.data_dir / _HISTORY_FILE)
+
+
+def _iter_history_path(history_path) -> Iterator[dict]:
+    """Stream-parse a JSONL history file, skipping malformed lines."""
     if not history_path.exists():
-        return []
+        return
 
-    records: list[dict] = []
-    with history_path.open("r", encoding="utf-8") as fh:
+    # orjson (when installed) parses each line several times faster than
+    # stdlib json; binary line iteration keeps memory flat.
+    loads = _orjson.loads if _HAS_ORJSON else json.loads
+    with history_path.open("rb") as fh:
         for lineno, raw in enumerate(fh, start=1):
-            raw = raw.strip()
-            if not raw:
+            if not raw.strip():
                 continue
             try:
-                records.append(json.loads(raw))
+                yield loads(raw)
             except json.JSONDecodeError as exc:
                 logger.warning("Skipping malformed history line %d: %s", lineno, exc)
-    return records
+
+
+def _load_history_path(history_path) -> list[dict]:
+    """Parse a JSONL history file at ``history_path`` into records."""
+    return list(_iter_history_path(history_path))
 
 
 def run_backtest(cfg: Config) -> None:
@@ -86,60 +136,158 @@ def run_backtest(cfg: Config) -> None:
       - Marks the signal correct/incorrect/excluded (uncertain)
       - Prints an accuracy summary table
     """
-    records = load_history(cfg)
+    # The backtest needs two passes (cache prescan + ordered evaluation), so
+    # the stream is materialized here; single-scan callers use iter_history.
+    records = list(iter_history(cfg))
     if not records:
         print("No signal history found. Run the pipeline at least once.")
         return
 
-    evaluated: list[dict] = []
-    for rec in records:
-        ticker = rec.get("ticker", "")
-        close_date = rec.get("last_close_date", "")
-        signal = rec.get("final_signal", "")
+    # Closed-candle prices for past dates never change, so evaluations are
+    # cached on disk and only records missing from the cache hit the network.
+    cache = _load_backtest_cache(cfg)
+    misses = [
+        r for r in records
+        if f"{r.get('ticker', '')}|{r.get('last_close_date', '')}" not in cache
+    ]
+    prices = _bulk_download(misses) if misses else None
+
+    # Each evaluation is one independent HTTP round-trip to yfinance, so
+    # fan them out across threads instead of fetching one ticker at a time.
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        results = list(
+            ex.map(functools.partial(_evaluate_record, prices=prices, cache=cache), records)
+        )
 
-        if not ticker or not close_date or not signal:
-            logger.warning("Skipping incomplete record: %s", rec)
-            continue
+    evaluated = [r for r in results if r is not None]
+    _save_backtest_cache(cfg, cache)
+    _print_backtest_results(evaluated)
+
+
+def _load_backtest_cache(cfg: Config) -> dict[str, list[float]]:
+    """Load the ticker|date → [signal_close, next_close] evaluation cache."""
+    cache_path = cfg.data_dir / _BACKTEST_CACHE_FILE
+    try:
+        if cache_path.exists():
+            return json.loads(cache_path.read_text(encoding="utf-8"))
+    except Exception as exc:
+        logger.warning("Could not read backtest cache, starting fresh: %s", exc)
+    return {}
+
+
+def _save_backtest_cache(cfg: Config, cache: dict[str, list[float]]) -> None:
+    """Persist the evaluation cache; write failures never break the backtest."""
+    if not cache:
+        return
+    cache_path = cfg.data_dir / _BACKTEST_CACHE_FILE
+    try:
+        cache_path.write_text(json.dumps(cache), encoding="utf-8")
+    except Exception as exc:
+        logger.warning("Could not write backtest cache: %s", exc)
+
+
+def _bulk_download(records: list[dict]):
+    """Fetch price history for all record tickers in one yf.download call.
 
+    Returns a ticker-keyed multi-index DataFrame covering the full date span
+    of the history, or None when the prescan or download fails (records then
+    fall back to per-ticker fetches).
+    """
+    tickers = sorted({r.get("ticker", "") for r in records if r.get("ticker")})
+    dates: list[datetime] = []
+    for rec in records:
         try:
-            end_date = (
-                datetime.strptime(close_date, "%Y-%m-%d") + timedelta(days=10)
-            ).strftime("%Y-%m-%d")
+            # fromisoformat is much faster than strptime and the stored
+            # close dates are already YYYY-MM-DD.
+            dates.append(datetime.fromisoformat(rec.get("last_close_date", "")))
+        except ValueError:
+            continue
+    if not tickers or not dates:
+        return None
+
+    start = str(min(dates).date())
+    end = str((max(dates) + timedelta(days=10)).date())
+    try:
+        return yf.download(
+            tickers, start=start, end=end,
+            progress=False, group_by="ticker", threads=True,
+        )
+    except Exception as exc:
+        logger.warning("Bulk price download failed, using per-ticker fetches: %s", exc)
+        return None
+
+
+def _evaluate_record(
+    rec: dict,
+    prices=None,
+    cache: dict[str, list[float]] | None = None,
+) -> dict | None:
+    """Evaluate a single history record against the next trading day's close.
+
+    Consults the disk ``cache`` first, then slices the bulk-downloaded
+    ``prices`` frame, falling back to a per-ticker fetch. Returns the record
+    augmented with actual-move fields, or None when the record is incomplete,
+    too recent, or the price fetch fails.
+    """
+    ticker = rec.get("ticker", "")
+    close_date = rec.get("last_close_date", "")
+    signal = rec.get("final_signal", "")
 
-            tk = yf.Ticker(ticker)
-            hist = tk.history(start=close_date, end=end_date)
+    if not ticker or not close_date or not signal:
+        logger.warning("Skipping incomplete record: %s", rec)
+        return None
+
+    cache_key = f"{ticker}|{close_date}"
+    try:
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is not None:
+            signal_close, next_close = float(cached[0]), float(cached[1])
+        else:
+            hist = None
+            if prices is not None:
+                try:
+                    hist = prices[ticker].loc[close_date:].dropna(subset=["Close"])
+                except KeyError:
+                    hist = None
+
+            if hist is None:
+                end_date = str(
+                    (datetime.fromisoformat(close_date) + timedelta(days=10)).date()
+                )
+                tk = yf.Ticker(ticker)
+                hist = tk.history(start=close_date, end=end_date)
 
             if len(hist) < 2:
                 # Next trading day not yet available (signal too recent)
                 logger.info(
                     "Skipping %s %s — next-day data not yet available", ticker, close_date
                 )
-                continue
+                return None
 
             signal_close = float(hist["Close"].iloc[0])
             next_close = float(hist["Close"].iloc[1])
-            actual_return_pct = (next_close - signal_close) / signal_close * 100
-
-            if signal in _BULLISH_SIGNALS:
-                correct: bool | None = actual_return_pct > 0
-            elif signal in _BEARISH_SIGNALS:
-                correct = actual_return_pct < 0
-            else:
-                correct = None  # "uncertain" — excluded from accuracy calc
-
-            evaluated.append(
-                {
-                    **rec,
-                    "signal_close": round(signal_close, 2),
-                    "next_close": round(next_close, 2),
-                    "actual_next_day_pct": round(actual_return_pct, 2),
-                    "correct": correct,
-                }
-            )
-        except Exception as exc:
-            logger.warning("Could not evaluate %s %s: %s", ticker, close_date, exc)
+            if cache is not None:
+                cache[cache_key] = [signal_close, next_close]
 
-    _print_backtest_results(evaluated)
+        actual_return_pct = (next_close - signal_close) / signal_close * 100
+
+        if signal in _BULLISH_SIGNALS:
+            correct: bool | None = actual_return_pct > 0
+        elif signal in _BEARISH_SIGNALS:
+            correct = actual_return_pct < 0
+        else:
+            correct = None  # "uncertain" — excluded from accuracy calc
+
+        return {
+            **rec,
+            "signal_close": round(signal_close, 2),
+            "next_close": round(next_close, 2),
+            "actual_next_day_pct": round(actual_return_pct, 2),
+            "correct": correct,
+        }
+    except Exception as exc:
+        logger.warning("Could not evaluate %s %s: %s", ticker, close_date, exc)
+        return None
 
 
 def _print_backtest_results(evaluated: list[dict]) -> None:
@@ -148,27 +296,38 @@ def _print_backtest_results(evaluated: list[dict]) -> None:
         print("No records could be evaluated (data may be too recent or history empty).")
         return
 
-    directional = [r for r in evaluated if r["correct"] is not None]
-    correct = [r for r in directional if r["correct"]]
-
-    print()
-    print("=" * 68)
-    print("  SIGNAL HISTORY BACKTEST")
-    print("=" * 68)
-    print(f"Total evaluated records:  {len(evaluated)}")
-    print(f"Directional signals:      {len(directional)}  (uncertain excluded)")
-
-    if directional:
-        accuracy = len(correct) / len(directional) * 100
-        print(f"Correct predictions:      {len(correct)}")
-        print(f"Accuracy:                 {accuracy:.1f}%")
-
-    print()
-    print(
+    # Single pass with running counters instead of materializing two
+    # intermediate filtered lists.
+    directional_n = correct_n = 0
+    for r in evaluated:
+        if r["correct"] is None:
+            continue
+        directional_n += 1
+        correct_n += bool(r["correct"])
+
+    # Buffer the whole report and emit it with one write() — one syscall
+    # instead of one per record.
+    sep = "=" * 68
+    out_lines = [
+        "",
+        sep,
+        "  SIGNAL HISTORY BACKTEST",
+        sep,
+        f"Total evaluated records:  {len(evaluated)}",
+        f"Directional signals:      {directional_n}  (uncertain excluded)",
+    ]
+
+    if directional_n:
+        accuracy = correct_n / directional_n * 100
+        out_lines.append(f"Correct predictions:      {correct_n}")
+        out_lines.append(f"Accuracy:                 {accuracy:.1f}%")
+
+    out_lines.append("")
+    out_lines.append(
         f"{'Date':<12} {'Ticker':<7} {'Signal':<22} {'Conf':>4}"
         f" {'Actual':>8}  {'OK?'}"
     )
-    print("-" * 68)
+    out_lines.append("-" * 68)
     for r in evaluated:
         if r["correct"] is True:
             ok = "✓"
@@ -176,7 +335,7 @@ def _print_backtest_results(evaluated: list[dict]) -> None:
             ok = "✗"
         else:
             ok = "—"
-        print(
+        out_lines.append(
             f"{r['last_close_date']:<12}"
             f" {r['ticker']:<7}"
             f" {r['final_signal']:<22}"
@@ -184,21 +343,39 @@ def _print_backtest_results(evaluated: list[dict]) -> None:
             f" {r['actual_next_day_pct']:>+7.2f}%"
             f"  {ok}"
         )
-    print("=" * 68)
-    print()
-    print(
+    out_lines.append(sep)
+    out_lines.append("")
+    out_lines.append(
         "NOTE: Next-day accuracy is a noisy metric. Use for trend "
         "observation only, not as performance guarantee."
     )
 
+    sys.stdout.write("\n".join(out_lines) + "\n")
+    sys.stdout.flush()
+
+
+@functools.lru_cache(maxsize=1)
+def _indexed_history(path_str: str, mtime: float) -> dict[str, list[dict]]:
+    """Ticker → records index over the history file.
+
+    Keyed on the file's mtime so appends invalidate the cached index
+    naturally; one parse serves every per-ticker query until the file
+    changes.
+    """
+    index: dict[str, list[dict]] = {}
+    for rec in _load_history_path(Path(path_str)):
+        index.setdefault(str(rec.get("ticker", "")).upper(), []).append(rec)
+    return index
+
 
 def query_history_by_ticker(cfg: Config, ticker: str) -> list[dict]:
     """Return history records for a specific ticker, newest first.
 
     Case-insensitive match on the ``ticker`` field.
     """
-    records = load_history(cfg)
-    filtered = [r for r in records if r.get("ticker", "").upper() == ticker.upper()]
+    history_path = cfg.data_dir / _HISTORY_FILE
+    mtime = history_path.stat().st_mtime if history_path.exists() else 0.0
+    filtered = _indexed_history(str(history_path), mtime).get(ticker.upper(), [])
     return list(reversed(filtered))
 
 
@@ -263,4 +440,4 @@ def format_history_table(records: list[dict]) -> str:
 
 
 if __name__ == "__main__":
-    run_backtest(Config())
+    run_backtest(get_config())
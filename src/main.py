@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import sys
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from typing import Callable, Final
 
-from src.utils import Config, DISCLAIMER, logger
+from src.utils import Config, DISCLAIMER, get_config, logger
 from src.news import fetch_news, Article
 from src.market import fetch_market_data, MarketData
 from src.ai_analyze import analyze, AnalysisResult
@@ -15,7 +18,24 @@ from src.notify import send_telegram
 from src.history import append_signal_record, query_history_by_ticker, format_history_table
 
 
-_HIGH_CONVICTION_THRESHOLD = 70
+_HIGH_CONVICTION_THRESHOLD: Final[int] = 70
+
+_SIGNAL_LABELS: Final[dict[str, str]] = {
+    "likely_up": "LIKELY UP",
+    "likely_down": "LIKELY DOWN",
+    "uncertain": "UNCERTAIN",
+    "high_conviction_up": "HIGH CONVICTION UP",
+    "high_conviction_down": "HIGH CONVICTION DOWN",
+}
+
+# Truth table for combine_signals keyed (bullish, bearish, high_conviction);
+# every combination not listed resolves to "uncertain".
+_SIGNAL_TABLE: Final[dict[tuple[bool, bool, bool], str]] = {
+    (True, False, True): "high_conviction_up",
+    (True, False, False): "likely_up",
+    (False, True, True): "high_conviction_down",
+    (False, True, False): "likely_down",
+}
 
 
 def combine_signals(ai: AnalysisResult, market: MarketData) -> str:
@@ -40,24 +60,13 @@ def combine_signals(ai: AnalysisResult, market: MarketData) -> str:
     )
     high_conviction = ai.confidence_0_100 >= _HIGH_CONVICTION_THRESHOLD
 
-    if bullish:
-        return "high_conviction_up" if high_conviction else "likely_up"
-    elif bearish:
-        return "high_conviction_down" if high_conviction else "likely_down"
-    else:
-        return "uncertain"
+    return _SIGNAL_TABLE.get((bullish, bearish, high_conviction), "uncertain")
 
 
+@functools.lru_cache(maxsize=8)
 def format_signal_label(signal: str) -> str:
-    """Human-readable signal label."""
-    labels = {
-        "likely_up": "LIKELY UP",
-        "likely_down": "LIKELY DOWN",
-        "uncertain": "UNCERTAIN",
-        "high_conviction_up": "HIGH CONVICTION UP",
-        "high_conviction_down": "HIGH CONVICTION DOWN",
-    }
-    return labels.get(signal, signal.upper())
+    """Human-readable signal label (memoized; the signal vocabulary is tiny)."""
+    return _SIGNAL_LABELS.get(signal, signal.upper())
 
 
 def build_report(
@@ -77,85 +86,114 @@ def build_report(
     past_records = query_history_by_ticker(cfg, cfg.ticker)
     history_table = format_history_table(past_records)
 
-    report = f"""
-{'='*60}
-  NEWS + MARKET DAILY SIGNAL
-{'='*60}
-
-Timestamp:     {now}
-Topic:         {cfg.topic}
-Ticker:        {cfg.ticker}
-Articles used: {len(articles)}
-
---- MARKET INDICATORS ---
-Last Close:      ${market.last_close} ({market.last_close_date})
-7-Day SMA:       ${market.sma_7}
-21-Day SMA:      ${market.sma_21}
-Close vs 7d SMA: {market.close_vs_sma7.upper()}
-7-Day Return:    {market.return_7d_pct}%
-RSI (14):        {market.rsi_14}{"  ← overbought" if market.rsi_14 > 70 else "  ← oversold" if market.rsi_14 < 30 else ""}
-BB Upper (20):   ${market.bb_upper}
-BB Middle (20):  ${market.bb_middle}
-BB Lower (20):   ${market.bb_lower}
-BB Position:     {market.bb_position.replace("_", " ").upper()}
-10-Day Avg Vol:  {market.vol_10d_avg:,.0f}
-Vol vs Avg:      {market.vol_vs_avg.upper()}
-
---- AI ANALYSIS ---
-News Sentiment:  {ai.news_sentiment.upper()}
-AI Bias:         {ai.directional_bias}
-AI Confidence:   {ai.confidence_0_100}/100
-
-Key Drivers:
-{drivers_str}
-
-Risk Factors:
-{risks_str}
-
-Rationale:
-  {ai.one_paragraph_rationale}
-
---- PAST PREDICTIONS ({cfg.ticker}) ---
-{history_table}
-
---- FINAL SIGNAL ---
->>> {signal_label} <<<
-
-{'='*60}
-{DISCLAIMER}
-{'='*60}
-"""
-    return report.strip()
+    # Precompute derived strings once, then assemble with a single join —
+    # cheaper than materializing one giant f-string template per call.
+    rsi_tag = (
+        "  ← overbought" if market.rsi_14 > 70
+        else "  ← oversold" if market.rsi_14 < 30
+        else ""
+    )
+    bb_pos = market.bb_position.replace("_", " ").upper()
+    rule = "=" * 60
+
+    parts = [
+        rule,
+        "  NEWS + MARKET DAILY SIGNAL",
+        rule,
+        "",
+        f"Timestamp:     {now}",
+        f"Topic:         {cfg.topic}",
+        f"Ticker:        {cfg.ticker}",
+        f"Articles used: {len(articles)}",
+        "",
+        "--- MARKET INDICATORS ---",
+        f"Last Close:      ${market.last_close} ({market.last_close_date})",
+        f"7-Day SMA:       ${market.sma_7}",
+        f"21-Day SMA:      ${market.sma_21}",
+        f"Close vs 7d SMA: {market.close_vs_sma7.upper()}",
+        f"7-Day Return:    {market.return_7d_pct}%",
+        f"RSI (14):        {market.rsi_14}{rsi_tag}",
+        f"BB Upper (20):   ${market.bb_upper}",
+        f"BB Middle (20):  ${market.bb_middle}",
+        f"BB Lower (20):   ${market.bb_lower}",
+        f"BB Position:     {bb_pos}",
+        f"10-Day Avg Vol:  {market.vol_10d_avg:,.0f}",
+        f"Vol vs Avg:      {market.vol_vs_avg.upper()}",
+        "",
+        "--- AI ANALYSIS ---",
+        f"News Sentiment:  {ai.news_sentiment.upper()}",
+        f"AI Bias:         {ai.directional_bias}",
+        f"AI Confidence:   {ai.confidence_0_100}/100",
+        "",
+        "Key Drivers:",
+        drivers_str,
+        "",
+        "Risk Factors:",
+        risks_str,
+        "",
+        "Rationale:",
+        f"  {ai.one_paragraph_rationale}",
+        "",
+        f"--- PAST PREDICTIONS ({cfg.ticker}) ---",
+        history_table,
+        "",
+        "--- FINAL SIGNAL ---",
+        f">>> {signal_label} <<<",
+        "",
+        rule,
+        DISCLAIMER,
+        rule,
+    ]
+    return "\n".join(parts)
 
 
 def run_pipeline(
     cfg: Config,
+    fetch_news_fn: Callable[[Config], list[Article]] | None = None,
+    fetch_market_fn: Callable[[Config], MarketData] | None = None,
+    analyze_fn: Callable[[list[Article], MarketData, Config], AnalysisResult] | None = None,
 ) -> tuple[list[Article], MarketData, AnalysisResult, str, str]:
     """Run the analysis pipeline and return (articles, market, ai_result, final_signal, report).
 
+    Callers may inject alternative fetchers (e.g. the Streamlit app passes
+    cached wrappers); by default the module-level fetch functions are used.
     Raises ValueError on market data failure so callers (Streamlit, tests) can
     handle errors gracefully without triggering sys.exit().
     """
-    # 1. Fetch news
-    try:
-        articles = fetch_news(cfg)
-    except Exception as exc:
-        logger.error("Failed to fetch news: %s", exc)
-        articles = []
-
-    if not articles:
-        logger.warning("No news articles found. Analysis will rely on market data only.")
-
-    # 2. Fetch market data — raise on failure (no sys.exit here)
-    try:
-        market = fetch_market_data(cfg)
-    except ValueError:
-        raise
-    except Exception as exc:
-        raise ValueError(f"Unexpected error fetching market data: {exc}") from exc
+    # Resolve defaults at call time so test patches of the module functions
+    # still take effect.
+    if fetch_news_fn is None:
+        fetch_news_fn = fetch_news
+    if fetch_market_fn is None:
+        fetch_market_fn = fetch_market_data
+    if analyze_fn is None:
+        analyze_fn = analyze
+
+    # 1+2. Fetch news and market data concurrently — the two calls are
+    # independent network I/O, so overlapping them saves the shorter leg.
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        news_future = ex.submit(fetch_news_fn, cfg)
+        market_future = ex.submit(fetch_market_fn, cfg)
+
+        try:
+            articles = news_future.result()
+        except Exception as exc:
+            logger.error("Failed to fetch news: %s", exc)
+            articles = []
+
+        if not articles:
+            logger.warning("No news articles found. Analysis will rely on market data only.")
+
+        # Market data failure still raises (no sys.exit here)
+        try:
+            market = market_future.result()
+        except ValueError:
+            raise
+        except Exception as exc:
+            raise ValueError(f"Unexpected error fetching market data: {exc}") from exc
 
     # 3. AI analysis
-    ai_result = analyze(articles, market, cfg)
+    ai_result = analyze_fn(articles, market, cfg)
 
     # 4. Combine signals
     final_signal = combine_signals(ai_result, market)
@@ -177,14 +215,14 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.history:
-        cfg = Config()
+        cfg = get_config()
         print(format_history_table(query_history_by_ticker(cfg, args.history)))
         return
 
     logger.info("Starting News + Market Daily Signal")
 
     # 1. Load and validate config
-    cfg = Config()
+    cfg = get_config()
     problems = cfg.validate()
     if problems:
         for p in problems:
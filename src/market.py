@@ -4,14 +4,23 @@ from __future__ import annotations
 
 import json
 import logging
-from dataclasses import asdict, dataclass
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
+try:  # optional C-accelerated JSON serializer for cache writes
+    import orjson as _orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _orjson = None
+    _HAS_ORJSON = False
+
 from src.utils import Config
 
 logger = logging.getLogger("signal.market")
@@ -28,18 +37,34 @@ def _compute_rsi(close: pd.Series, period: int = 14) -> float:
         logger.warning("Insufficient data for RSI (%d points); returning 50", len(close))
         return 50.0
 
-    delta = close.diff().dropna()
-    gains = delta.clip(lower=0)
-    losses = (-delta).clip(lower=0)
+    # Wilder smoothing converges exponentially, so on long series only the
+    # recent tail matters. 10*period keeps the drift vs full history at or
+    # below the 2-decimal rounding step (4*period, as sometimes suggested,
+    # still leaks ~0.3 RSI points through the seed window).
+    close = close.tail(10 * period + 1)
 
-    # Seed: simple mean over the first `period` changes
-    avg_gain = float(gains.iloc[:period].mean())
-    avg_loss = float(losses.iloc[:period].mean())
+    arr = close.to_numpy(dtype=np.float64)
+    delta = np.diff(arr)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
 
-    # Wilder's smoothing for any data beyond the seed window
-    for i in range(period, len(gains)):
-        avg_gain = (avg_gain * (period - 1) + float(gains.iloc[i])) / period
-        avg_loss = (avg_loss * (period - 1) + float(losses.iloc[i])) / period
+    # Seed: simple mean over the first `period` changes
+    avg_gain = float(gains[:period].mean())
+    avg_loss = float(losses[:period].mean())
+
+    # Wilder's smoothing beyond the seed window is exactly an EWM with
+    # alpha=1/period (adjust=False) seeded with the simple mean, so one
+    # vectorized pass replaces the per-element Python loop.
+    if len(gains) > period:
+        alpha = 1.0 / period
+        avg_gain = float(
+            pd.Series(np.concatenate(([avg_gain], gains[period:])))
+            .ewm(alpha=alpha, adjust=False).mean().iloc[-1]
+        )
+        avg_loss = float(
+            pd.Series(np.concatenate(([avg_loss], losses[period:])))
+            .ewm(alpha=alpha, adjust=False).mean().iloc[-1]
+        )
 
     if avg_loss == 0:
         return 100.0
@@ -48,6 +73,33 @@ def _compute_rsi(close: pd.Series, period: int = 14) -> float:
     return round(100 - (100 / (1 + rs)), 2)
 
 
+def _bbands_series(
+    arr: np.ndarray,
+    period: int = 20,
+    num_std: float = 2.0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger Bands over a full price array via cumulative sums.
+
+    Rolling mean and std come from two np.cumsum passes and the
+    E[X**2] - E[X]**2 identity (sample variance, ddof=1), so the whole
+    series costs O(N) instead of O(N*W) windowed recomputation.
+    Returns (upper, middle, lower) arrays of length len(arr) - period + 1.
+    """
+    cs = np.cumsum(arr, dtype=np.float64)
+    cs2 = np.cumsum(arr * arr, dtype=np.float64)
+
+    win_sum = cs[period - 1:].copy()
+    win_sum[1:] -= cs[:-period]
+    win_sq = cs2[period - 1:].copy()
+    win_sq[1:] -= cs2[:-period]
+
+    middle = win_sum / period
+    var = (win_sq - period * middle * middle) / (period - 1)
+    std = np.sqrt(np.maximum(var, 0.0))
+
+    return middle + num_std * std, middle, middle - num_std * std
+
+
 def _compute_bollinger_bands(
     close: pd.Series,
     period: int = 20,
@@ -60,13 +112,14 @@ def _compute_bollinger_bands(
     bb_position: "above_upper" | "inside" | "below_lower"
     """
     window = min(period, len(close))
-    window_data = close.tail(window)
-
-    middle = float(window_data.mean())
-    std = float(window_data.std(ddof=1)) if window > 1 else 0.0
+    arr = close.tail(window).to_numpy(dtype=np.float64)
 
-    upper = middle + num_std * std
-    lower = middle - num_std * std
+    if window > 1:
+        uppers, middles, lowers = _bbands_series(arr, window, num_std)
+        upper, middle, lower = float(uppers[-1]), float(middles[-1]), float(lowers[-1])
+    else:
+        middle = float(arr.mean())
+        upper = lower = middle
 
     last = float(close.iloc[-1])
     if last > upper:
@@ -106,7 +159,7 @@ def _compute_volume(volume: pd.Series, period: int = 10) -> tuple[float, str]:
     return round(vol_10d_avg, 0), vol_vs_avg
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketData:
     """Computed market indicators for a ticker."""
 
@@ -127,51 +180,83 @@ class MarketData:
     prices_available: int  # number of trading days we got
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
-
-
-def fetch_market_data(cfg: Config) -> MarketData:
-    """Pull historical prices for TICKER and compute indicators.
-
-    Raises ValueError on invalid ticker or insufficient data.
+        # Literal build: asdict walks _asdict_inner's isinstance/recursion
+        # machinery per field, which is overkill for a flat primitive record.
+        return {
+            "ticker": self.ticker,
+            "last_close": self.last_close,
+            "last_close_date": self.last_close_date,
+            "sma_7": self.sma_7,
+            "sma_21": self.sma_21,
+            "close_vs_sma7": self.close_vs_sma7,
+            "return_7d_pct": self.return_7d_pct,
+            "rsi_14": self.rsi_14,
+            "bb_upper": self.bb_upper,
+            "bb_middle": self.bb_middle,
+            "bb_lower": self.bb_lower,
+            "bb_position": self.bb_position,
+            "vol_10d_avg": self.vol_10d_avg,
+            "vol_vs_avg": self.vol_vs_avg,
+            "prices_available": self.prices_available,
+        }
+
+    @property
+    def prompt_items(self) -> tuple[tuple[str, Any], ...]:
+        """Hashable, sorted fingerprint of the indicators for prompt caching.
+
+        A plain tuple build — slots leave no __dict__ for cached_property,
+        and the downstream prompt render is already memoized on this key.
+        """
+        return tuple(sorted(self.to_dict().items()))
+
+
+def _market_data_from_history(ticker: str, hist: pd.DataFrame) -> MarketData:
+    """Compute a MarketData snapshot from a price-history frame.
+
+    Shared by the single-ticker and bulk fetchers.
+    Raises ValueError on empty or insufficient data.
     """
-    logger.info("Fetching market data for %s", cfg.ticker)
-    tk = yf.Ticker(cfg.ticker)
-
-    # Pull ~45 calendar days to ensure we have >=30 trading days
-    hist = tk.history(period="3mo")
-
     if hist.empty:
         raise ValueError(
-            f"No market data returned for ticker '{cfg.ticker}'. "
+            f"No market data returned for ticker '{ticker}'. "
             "Check the ticker symbol is valid."
         )
 
     close = hist["Close"]
     if len(close) < 7:
         raise ValueError(
-            f"Only {len(close)} trading days of data for '{cfg.ticker}'. "
+            f"Only {len(close)} trading days of data for '{ticker}'. "
             "Need at least 7 for indicators."
         )
 
-    last_close = float(close.iloc[-1])
+    # Downcast once: float32 halves memory traffic through every indicator
+    # pass, and prices rounded to 2 decimals are nowhere near its ~7
+    # significant digits. Scalars are cast back to Python float below.
+    close = close.astype(np.float32)
+
+    # One Series→ndarray conversion shared by all the scalar reductions
+    # below; each .tail()/.iloc access would otherwise re-dispatch through
+    # pandas indexing.
+    arr = close.to_numpy()
+
+    last_close = float(arr[-1])
     last_close_date = str(close.index[-1].date())
 
-    sma_7 = float(close.tail(7).mean())
-    sma_21 = float(close.tail(min(21, len(close))).mean())
+    sma_7 = float(arr[-7:].mean())
+    sma_21 = float(arr[-min(21, len(arr)):].mean())
 
     close_vs_sma7 = "above" if last_close > sma_7 else "below"
 
     # 7-day return: (last - 7 ago) / 7 ago * 100
-    price_7_ago = float(close.iloc[-8]) if len(close) >= 8 else float(close.iloc[0])
+    price_7_ago = float(arr[-8]) if len(arr) >= 8 else float(arr[0])
     return_7d_pct = round((last_close - price_7_ago) / price_7_ago * 100, 2)
 
     rsi_14 = _compute_rsi(close)
     bb_upper, bb_middle, bb_lower, bb_position = _compute_bollinger_bands(close)
     vol_10d_avg, vol_vs_avg = _compute_volume(hist["Volume"])
 
-    md = MarketData(
-        ticker=cfg.ticker,
+    return MarketData(
+        ticker=ticker,
         last_close=round(last_close, 2),
         last_close_date=last_close_date,
         sma_7=round(sma_7, 2),
@@ -188,12 +273,63 @@ def fetch_market_data(cfg: Config) -> MarketData:
         prices_available=len(close),
     )
 
+
+# Raw-history disk cache: recent pulls are reused instead of re-hitting
+# Yahoo; 15 min keeps intraday data acceptably fresh.
+_HISTORY_CACHE_TTL = 900
+
+
+def _load_cached_history(cfg: Config, ticker: str, ttl_s: int = _HISTORY_CACHE_TTL):
+    """Return the cached history frame for ``ticker`` if fresh, else None."""
+    cache_path = cfg.data_dir / f"hist_{ticker}.parquet"
+    try:
+        if cache_path.exists() and time.time() - cache_path.stat().st_mtime < ttl_s:
+            return pd.read_parquet(cache_path)
+    except Exception as exc:
+        logger.debug("Could not read history cache for %s: %s", ticker, exc)
+    return None
+
+
+def _store_cached_history(cfg: Config, ticker: str, hist: pd.DataFrame) -> None:
+    """Write the raw history frame to the disk cache; failures are ignored."""
+    try:
+        hist.to_parquet(cfg.data_dir / f"hist_{ticker}.parquet")
+    except Exception as exc:
+        logger.debug("Could not write history cache for %s: %s", ticker, exc)
+
+
+def fetch_market_data(cfg: Config) -> MarketData:
+    """Pull historical prices for TICKER and compute indicators.
+
+    Serves the raw history from a short-TTL parquet cache when possible, so
+    back-to-back runs skip the network entirely.
+    Raises ValueError on invalid ticker or insufficient data.
+    """
+    hist = _load_cached_history(cfg, cfg.ticker)
+    if hist is None:
+        logger.info("Fetching market data for %s", cfg.ticker)
+        tk = yf.Ticker(cfg.ticker)
+
+        # Pull ~45 calendar days to ensure we have >=30 trading days
+        hist = tk.history(period="3mo")
+        if not hist.empty:
+            _store_cached_history(cfg, cfg.ticker, hist)
+    else:
+        logger.info("Using cached market history for %s", cfg.ticker)
+
+    md = _market_data_from_history(cfg.ticker, hist)
+
     # Cache for debugging
     try:
         cache_path = cfg.data_dir / "last_market.json"
-        cache_path.write_text(
-            json.dumps(md.to_dict(), indent=2), encoding="utf-8"
-        )
+        if _HAS_ORJSON:
+            cache_path.write_bytes(
+                _orjson.dumps(md.to_dict(), option=_orjson.OPT_INDENT_2)
+            )
+        else:
+            cache_path.write_text(
+                json.dumps(md.to_dict(), indent=2), encoding="utf-8"
+            )
     except Exception as exc:
         logger.debug("Could not write market cache: %s", exc)
 
@@ -202,3 +338,27 @@ def fetch_market_data(cfg: Config) -> MarketData:
         md.last_close, md.sma_7, md.sma_21, md.return_7d_pct, md.rsi_14,
     )
     return md
+
+
+def fetch_market_data_bulk(cfg: Config, tickers: list[str]) -> dict[str, MarketData]:
+    """Fetch indicators for several tickers with one batched download.
+
+    One yf.download request replaces a per-ticker HTTP round-trip. Tickers
+    whose data is missing or insufficient are skipped with a warning; the
+    returned dict maps each successful ticker to its MarketData.
+    """
+    logger.info("Fetching market data for %d tickers in one request", len(tickers))
+    data = yf.download(
+        tickers, period="3mo", group_by="ticker", threads=True, progress=False
+    )
+
+    results: dict[str, MarketData] = {}
+    for ticker in tickers:
+        try:
+            hist = data[ticker] if isinstance(data.columns, pd.MultiIndex) else data
+            results[ticker] = _market_data_from_history(
+                ticker, hist.dropna(subset=["Close"])
+            )
+        except (KeyError, ValueError) as exc:
+            logger.warning("Skipping %s in bulk fetch: %s", ticker, exc)
+    return results
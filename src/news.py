@@ -2,18 +2,35 @@
 
 from __future__ import annotations
 
-import hashlib
+import functools
 import json
 import logging
-from dataclasses import asdict, dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
 import feedparser
-import requests
+import pandas as pd
 
-from src.utils import Config
+try:  # optional C-accelerated JSON serializer for cache writes
+    import orjson as _orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _orjson = None
+    _HAS_ORJSON = False
+
+try:  # optional C-backed XML parser for the RSS fast path
+    from lxml import etree as _etree
+    _HAS_LXML = True
+except ImportError:
+    _etree = None
+    _HAS_LXML = False
+
+from src.utils import Config, get_http_session
 
 logger = logging.getLogger("signal.news")
 
@@ -21,7 +38,7 @@ logger = logging.getLogger("signal.news")
 # Data model
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Article:
     title: str
     source: str
@@ -29,10 +46,46 @@ class Article:
     summary: str
     url: str
 
-    def dedup_key(self) -> str:
-        """Deterministic key for deduplication by URL + title."""
-        raw = (self.url.strip().lower() + "|" + self.title.strip().lower())
-        return hashlib.sha256(raw.encode()).hexdigest()
+    # Normalized (url, title) identity, computed once at construction so the
+    # dedup pass does not re-run strip/lower per article per run.
+    _key: tuple[str, str] = field(init=False, repr=False, compare=False)
+    # Epoch seconds of `published` (0 if unknown/unparseable) so the newest-
+    # first sort compares ints instead of ISO strings.
+    _published_ts: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # object.__setattr__ is the sanctioned escape hatch for frozen fields.
+        object.__setattr__(
+            self, "_key", (self.url.strip().casefold(), self.title.strip().casefold())
+        )
+        ts = 0
+        if self.published:
+            try:
+                ts = int(datetime.fromisoformat(self.published).timestamp())
+            except ValueError:
+                ts = 0
+        object.__setattr__(self, "_published_ts", ts)
+
+    def to_dict(self) -> dict[str, str]:
+        # Literal build of the public fields — skips asdict's recursive
+        # machinery and keeps the derived _key/_published_ts internals out
+        # of the serialized form.
+        return {
+            "title": self.title,
+            "source": self.source,
+            "published": self.published,
+            "summary": self.summary,
+            "url": self.url,
+        }
+
+    @property
+    def prompt_key(self) -> tuple[str, str, str, str]:
+        """Hashable fingerprint of the fields that feed the AI prompt.
+
+        A plain tuple build — slots leave no __dict__ for cached_property,
+        and the downstream prompt render is already memoized on these keys.
+        """
+        return (self.title, self.source, self.published, self.url)
 
 
 # ---------------------------------------------------------------------------
@@ -54,7 +107,7 @@ def _fetch_newsapi(cfg: Config) -> list[Article]:
         "apiKey": cfg.newsapi_key,
     }
     logger.info("Fetching news from NewsAPI for topic=%s", cfg.topic)
-    resp = requests.get(_NEWSAPI_URL, params=params, timeout=20)
+    resp = get_http_session().get(_NEWSAPI_URL, params=params, timeout=20)
     resp.raise_for_status()
     data = resp.json()
 
@@ -89,38 +142,120 @@ _RSS_FEEDS: list[tuple[str, str]] = [
 ]
 
 
-def _fetch_rss(cfg: Config) -> list[Article]:
-    """Fetch articles from RSS feeds (no API key required)."""
+# Precompiled XPath expressions for the 4 fields _fetch_rss actually uses;
+# feedparser builds a full tolerant object model we mostly throw away.
+if _HAS_LXML:
+    _XP_ITEM = _etree.XPath(".//item")
+    _XP_TITLE = _etree.XPath("./title/text()")
+    _XP_LINK = _etree.XPath("./link/text()")
+    _XP_DESC = _etree.XPath("./description/text()")
+    _XP_DATE = _etree.XPath("./pubDate/text()")
+
+
+def _parse_rss_lxml(xml_bytes: bytes, feed_name: str) -> list[Article]:
+    """Parse an RSS 2.0 payload with lxml; returns [] when nothing matches.
+
+    Atom / RSS 1.0 feeds yield no <item> elements here and fall back to
+    feedparser in the caller.
+    """
+    parser = _etree.XMLParser(recover=True, huge_tree=False)
+    root = _etree.fromstring(xml_bytes, parser=parser)
+    if root is None:
+        return []
+
+    articles: list[Article] = []
+    for item in _XP_ITEM(root)[:20]:
+        pub_raw = (_XP_DATE(item) or [""])[0]
+        published = ""
+        if pub_raw:
+            try:
+                published = parsedate_to_datetime(pub_raw).astimezone(timezone.utc).isoformat()
+            except (TypeError, ValueError):
+                published = pub_raw
+
+        articles.append(
+            Article(
+                title=(_XP_TITLE(item) or [""])[0].strip(),
+                source=feed_name,
+                published=published,
+                summary=((_XP_DESC(item) or [""])[0] or "")[:300],
+                url=(_XP_LINK(item) or [""])[0].strip(),
+            )
+        )
+    return articles
+
+
+def _parse_one_feed(feed_name: str, url: str) -> list[Article]:
+    """Fetch and parse a single RSS feed; errors degrade to an empty list."""
+    logger.info("Fetching RSS: %s (%s)", feed_name, url)
     articles: list[Article] = []
-    for feed_name, url_template in _RSS_FEEDS:
-        url = url_template.format(query=cfg.topic, ticker=cfg.ticker)
-        logger.info("Fetching RSS: %s (%s)", feed_name, url)
+    try:
+        # Fetch raw bytes over the shared pooled session; feedparser can
+        # consume the same bytes if the lxml fast path yields nothing.
+        xml_bytes = None
         try:
-            feed = feedparser.parse(url)
-            if feed.bozo and not feed.entries:
-                logger.warning("RSS feed %s returned no entries (bozo=%s)", feed_name, feed.bozo_exception)
-                continue
-            for entry in feed.entries[:20]:
-                published = ""
-                if hasattr(entry, "published_parsed") and entry.published_parsed:
-                    try:
-                        published = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc).isoformat()
-                    except Exception:
-                        published = getattr(entry, "published", "")
-                elif hasattr(entry, "published"):
-                    published = entry.published
-
-                articles.append(
-                    Article(
-                        title=getattr(entry, "title", "").strip(),
-                        source=feed_name,
-                        published=published,
-                        summary=(getattr(entry, "summary", "") or "")[:300],
-                        url=getattr(entry, "link", ""),
-                    )
-                )
+            resp = get_http_session().get(url, timeout=20)
+            resp.raise_for_status()
+            xml_bytes = resp.content
         except Exception as exc:
-            logger.warning("Failed to fetch RSS feed %s: %s", feed_name, exc)
+            logger.debug("Direct fetch of %s failed, letting feedparser fetch: %s", feed_name, exc)
+
+        if _HAS_LXML and xml_bytes:
+            try:
+                articles = _parse_rss_lxml(xml_bytes, feed_name)
+            except Exception as exc:
+                logger.debug("lxml parse of %s failed, falling back: %s", feed_name, exc)
+                articles = []
+            if articles:
+                return articles
+
+        feed = feedparser.parse(xml_bytes if xml_bytes is not None else url)
+        if feed.bozo and not feed.entries:
+            logger.warning("RSS feed %s returned no entries (bozo=%s)", feed_name, feed.bozo_exception)
+            return []
+        for entry in feed.entries[:20]:
+            published = ""
+            if hasattr(entry, "published_parsed") and entry.published_parsed:
+                try:
+                    published = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc).isoformat()
+                except Exception:
+                    published = getattr(entry, "published", "")
+            elif hasattr(entry, "published"):
+                published = entry.published
+
+            articles.append(
+                Article(
+                    title=getattr(entry, "title", "").strip(),
+                    source=feed_name,
+                    published=published,
+                    summary=(getattr(entry, "summary", "") or "")[:300],
+                    url=getattr(entry, "link", ""),
+                )
+            )
+    except Exception as exc:
+        logger.warning("Failed to fetch RSS feed %s: %s", feed_name, exc)
+    return articles
+
+
+def _fetch_rss(cfg: Config) -> list[Article]:
+    """Fetch articles from RSS feeds (no API key required).
+
+    The feeds are independent network calls, so they are fetched
+    concurrently — total latency is the slowest feed, not the sum.
+    """
+    articles: list[Article] = []
+    with ThreadPoolExecutor(max_workers=len(_RSS_FEEDS)) as ex:
+        futures = {
+            ex.submit(
+                _parse_one_feed, feed_name, url_template.format(query=cfg.topic, ticker=cfg.ticker)
+            ): feed_name
+            for feed_name, url_template in _RSS_FEEDS
+        }
+        for fut in as_completed(futures):
+            try:
+                articles.extend(fut.result())
+            except Exception as exc:
+                logger.warning("RSS worker for %s failed: %s", futures[fut], exc)
     logger.info("RSS feeds returned %d articles total", len(articles))
     return articles
 
@@ -130,11 +265,15 @@ def _fetch_rss(cfg: Config) -> list[Article]:
 # ---------------------------------------------------------------------------
 
 def _deduplicate(articles: list[Article]) -> list[Article]:
-    """Remove duplicate articles by URL+title hash."""
-    seen: set[str] = set()
+    """Remove duplicate articles by normalized (URL, title).
+
+    Each article's key is precomputed at construction (``Article._key``), so
+    this pass is pure set membership with no per-call string work.
+    """
+    seen: set[tuple[str, str]] = set()
     unique: list[Article] = []
     for art in articles:
-        key = art.dedup_key()
+        key = art._key
         if key not in seen and art.title:
             seen.add(key)
             unique.append(art)
@@ -142,27 +281,39 @@ def _deduplicate(articles: list[Article]) -> list[Article]:
 
 
 def _filter_by_lookback(articles: list[Article], hours: int) -> list[Article]:
-    """Keep only articles within the lookback window."""
+    """Keep only articles within the lookback window.
+
+    Timestamps are parsed in one vectorized pd.to_datetime pass instead of a
+    per-article fromisoformat with try/except. Unknown or unparseable publish
+    times coerce to NaT and are kept (better to include).
+    """
+    if not articles:
+        return []
+
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-    filtered: list[Article] = []
-    for art in articles:
-        if not art.published:
-            # Keep articles with unknown publish time (better to include)
-            filtered.append(art)
-            continue
-        try:
-            pub_dt = datetime.fromisoformat(art.published.replace("Z", "+00:00"))
-            if pub_dt >= cutoff:
-                filtered.append(art)
-        except (ValueError, TypeError):
-            filtered.append(art)  # Keep if we can't parse
-    return filtered
+    ts = pd.to_datetime(
+        [art.published or None for art in articles], utc=True, errors="coerce"
+    )
+    keep = ts.isna() | (ts >= cutoff)
+    return [art for art, k in zip(articles, keep) if k]
 
 
 # ---------------------------------------------------------------------------
 # Sentiment pre-filter (optional, requires vaderSentiment)
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=1)
+def _get_vader():
+    """Lazily build and memoize the VADER analyzer.
+
+    The constructor parses a ~7500-entry lexicon file from disk, so one
+    instance is shared for the life of the process. ImportError is not
+    cached by lru_cache, so the missing-dependency path stays cheap to retry.
+    """
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer  # type: ignore[import]
+    return SentimentIntensityAnalyzer()
+
+
 def _pre_filter_by_sentiment(articles: list[Article], threshold: float) -> list[Article]:
     """Drop near-neutral articles using VADER compound score.
 
@@ -171,12 +322,10 @@ def _pre_filter_by_sentiment(articles: list[Article], threshold: float) -> list[
     vaderSentiment is not installed.
     """
     try:
-        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer  # type: ignore[import]
+        analyzer = _get_vader()
     except ImportError:
         logger.warning("vaderSentiment not installed; skipping sentiment pre-filter")
         return articles
-
-    analyzer = SentimentIntensityAnalyzer()
     kept: list[Article] = []
     dropped = 0
     for art in articles:
@@ -224,15 +373,20 @@ def fetch_news(cfg: Config) -> list[Article]:
         articles = _pre_filter_by_sentiment(articles, cfg.sentiment_filter_threshold)
 
     # Sort by published time (newest first), unknowns at end
-    articles.sort(key=lambda a: a.published or "0000", reverse=True)
+    articles.sort(key=attrgetter("_published_ts"), reverse=True)
 
     # Cache to data dir for debugging
     try:
         cache_path = cfg.data_dir / "last_news.json"
-        cache_path.write_text(
-            json.dumps([asdict(a) for a in articles], indent=2, default=str),
-            encoding="utf-8",
-        )
+        payload = [a.to_dict() for a in articles]
+        if _HAS_ORJSON:
+            cache_path.write_bytes(
+                _orjson.dumps(payload, option=_orjson.OPT_INDENT_2, default=str)
+            )
+        else:
+            cache_path.write_text(
+                json.dumps(payload, indent=2, default=str), encoding="utf-8"
+            )
     except Exception as exc:
         logger.debug("Could not write news cache: %s", exc)
 
@@ -6,7 +6,7 @@ import logging
 
 import requests
 
-from src.utils import Config
+from src.utils import Config, get_http_session
 
 logger = logging.getLogger("signal.notify")
 
@@ -37,7 +37,7 @@ def send_telegram(message: str, cfg: Config) -> bool:
 
     try:
         logger.info("Sending Telegram notification to chat_id=%s", cfg.telegram_chat_id)
-        resp = requests.post(url, json=payload, timeout=15)
+        resp = get_http_session().post(url, json=payload, timeout=15)
         resp.raise_for_status()
         data = resp.json()
         if data.get("ok"):
@@ -2,96 +2,150 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 
+import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ---------------------------------------------------------------------------
 # Load .env from project root (two levels up from this file, or cwd)
 # ---------------------------------------------------------------------------
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 _ENV_PATH = _PROJECT_ROOT / ".env"
-load_dotenv(_ENV_PATH)
+# Sentinel guard: skip the disk walk + reparse when the file was already
+# loaded in this process or inherited from a parent (cron wrappers,
+# Streamlit reruns, subprocesses all re-import this module).
+if not os.getenv("_SIGNAL_ENV_LOADED"):
+    load_dotenv(_ENV_PATH)
+    os.environ["_SIGNAL_ENV_LOADED"] = "1"
 
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
 LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-logging.basicConfig(format=LOG_FORMAT, level=logging.INFO, stream=sys.stdout)
+# Only configure the root logger if the embedding process (Streamlit, tests,
+# a re-imported script) has not already installed handlers — prevents
+# duplicate handlers that would double every formatted write.
+if not logging.getLogger().handlers:
+    logging.basicConfig(format=LOG_FORMAT, level=logging.INFO, stream=sys.stdout)
 logger = logging.getLogger("signal")
 
 
 # ---------------------------------------------------------------------------
 # Config dataclass
 # ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=1)
+def _env_defaults() -> dict[str, str | int | float | bool]:
+    """Parse every configurable env var once per process.
+
+    Config() is constructed repeatedly (tests, dataclasses.replace copies);
+    memoizing the ~20 os.environ lookups and int/float/bool parses makes
+    each later construction a handful of dict reads. Values are immutable
+    scalars, so sharing the snapshot is safe.
+    """
+    return {
+        "topic": os.getenv("TOPIC", "Microsoft"),
+        "ticker": os.getenv("TICKER", "MSFT"),
+        "news_lookback_hours": int(os.getenv("NEWS_LOOKBACK_HOURS", "24")),
+        "ai_provider": os.getenv("AI_PROVIDER", "openai").lower(),
+        "openai_api_key": os.getenv("OPENAI_API_KEY", ""),
+        "openai_model": os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+        "claude_api_key": os.getenv("CLAUDE_API_KEY", ""),
+        "claude_model": os.getenv("CLAUDE_MODEL", "claude-opus-4-6"),
+        "google_api_key": os.getenv("GOOGLE_API_KEY", ""),
+        "google_model": os.getenv("GOOGLE_MODEL", "gemini-1.5-flash"),
+        "perplexity_api_key": os.getenv("PERPLEXITY_API_KEY", ""),
+        "perplexity_model": os.getenv("PERPLEXITY_MODEL", "sonar"),
+        "newsapi_key": os.getenv("NEWSAPI_KEY", ""),
+        "enable_analysis_cache": os.getenv("ENABLE_ANALYSIS_CACHE", "true").lower() == "true",
+        "analysis_cache_ttl": int(os.getenv("ANALYSIS_CACHE_TTL", "300")),
+        "confidence_threshold": int(os.getenv("CONFIDENCE_THRESHOLD", "40")),
+        "pre_filter_sentiment": os.getenv("PRE_FILTER_SENTIMENT", "false").lower() == "true",
+        "sentiment_filter_threshold": float(os.getenv("SENTIMENT_FILTER_THRESHOLD", "0.05")),
+        "telegram_bot_token": os.getenv("TELEGRAM_BOT_TOKEN", ""),
+        "telegram_chat_id": os.getenv("TELEGRAM_CHAT_ID", ""),
+    }
+
+
 @dataclass
 class Config:
     """All runtime configuration, loaded from environment variables."""
 
-    topic: str = field(default_factory=lambda: os.getenv("TOPIC", "Microsoft"))
-    ticker: str = field(default_factory=lambda: os.getenv("TICKER", "MSFT"))
+    topic: str = field(default_factory=lambda: _env_defaults()["topic"])
+    ticker: str = field(default_factory=lambda: _env_defaults()["ticker"])
     news_lookback_hours: int = field(
-        default_factory=lambda: int(os.getenv("NEWS_LOOKBACK_HOURS", "24"))
+        default_factory=lambda: _env_defaults()["news_lookback_hours"]
     )
 
     # ── AI provider selection ────────────────────────────────────────────────
-    # Supported values: openai | claude | google | perplexity
+    # Supported values: openai | claude | google | perplexity,
+    # plus ensemble (all configured providers, highest confidence wins)
+    # and race (all configured providers, fastest wins)
     ai_provider: str = field(
-        default_factory=lambda: os.getenv("AI_PROVIDER", "openai").lower()
+        default_factory=lambda: _env_defaults()["ai_provider"]
     )
 
     # OpenAI
     openai_api_key: str = field(
-        default_factory=lambda: os.getenv("OPENAI_API_KEY", "")
+        default_factory=lambda: _env_defaults()["openai_api_key"]
     )
     openai_model: str = field(
-        default_factory=lambda: os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        default_factory=lambda: _env_defaults()["openai_model"]
     )
 
     # Claude (Anthropic)
     claude_api_key: str = field(
-        default_factory=lambda: os.getenv("CLAUDE_API_KEY", "")
+        default_factory=lambda: _env_defaults()["claude_api_key"]
     )
     claude_model: str = field(
-        default_factory=lambda: os.getenv("CLAUDE_MODEL", "claude-opus-4-6")
+        default_factory=lambda: _env_defaults()["claude_model"]
     )
 
     # Google Gemini
     google_api_key: str = field(
-        default_factory=lambda: os.getenv("GOOGLE_API_KEY", "")
+        default_factory=lambda: _env_defaults()["google_api_key"]
     )
     google_model: str = field(
-        default_factory=lambda: os.getenv("GOOGLE_MODEL", "gemini-1.5-flash")
+        default_factory=lambda: _env_defaults()["google_model"]
     )
 
     # Perplexity
     perplexity_api_key: str = field(
-        default_factory=lambda: os.getenv("PERPLEXITY_API_KEY", "")
+        default_factory=lambda: _env_defaults()["perplexity_api_key"]
     )
     perplexity_model: str = field(
-        default_factory=lambda: os.getenv("PERPLEXITY_MODEL", "sonar")
+        default_factory=lambda: _env_defaults()["perplexity_model"]
     )
 
     # ── Other settings ───────────────────────────────────────────────────────
-    newsapi_key: str = field(default_factory=lambda: os.getenv("NEWSAPI_KEY", ""))
+    newsapi_key: str = field(default_factory=lambda: _env_defaults()["newsapi_key"])
+    enable_analysis_cache: bool = field(
+        default_factory=lambda: _env_defaults()["enable_analysis_cache"]
+    )
+    analysis_cache_ttl: int = field(
+        default_factory=lambda: _env_defaults()["analysis_cache_ttl"]
+    )
     confidence_threshold: int = field(
-        default_factory=lambda: int(os.getenv("CONFIDENCE_THRESHOLD", "40"))
+        default_factory=lambda: _env_defaults()["confidence_threshold"]
     )
     pre_filter_sentiment: bool = field(
-        default_factory=lambda: os.getenv("PRE_FILTER_SENTIMENT", "false").lower() == "true"
+        default_factory=lambda: _env_defaults()["pre_filter_sentiment"]
     )
     sentiment_filter_threshold: float = field(
-        default_factory=lambda: float(os.getenv("SENTIMENT_FILTER_THRESHOLD", "0.05"))
+        default_factory=lambda: _env_defaults()["sentiment_filter_threshold"]
     )
     telegram_bot_token: str = field(
-        default_factory=lambda: os.getenv("TELEGRAM_BOT_TOKEN", "")
+        default_factory=lambda: _env_defaults()["telegram_bot_token"]
     )
     telegram_chat_id: str = field(
-        default_factory=lambda: os.getenv("TELEGRAM_CHAT_ID", "")
+        default_factory=lambda: _env_defaults()["telegram_chat_id"]
     )
 
     # Derived
@@ -113,8 +167,17 @@ class Config:
             problems.append("GOOGLE_API_KEY is not set.")
         elif provider == "perplexity" and not self.perplexity_api_key:
             problems.append("PERPLEXITY_API_KEY is not set.")
+        elif provider in {"ensemble", "race"} and not (
+            self.openai_api_key
+            or self.claude_api_key
+            or self.google_api_key
+            or self.perplexity_api_key
+        ):
+            problems.append("No provider API key is set (ensemble/race needs at least one).")
         # Fallback: if provider is unknown or openai is default, check openai key
-        elif provider not in {"openai", "claude", "google", "perplexity"} and not self.openai_api_key:
+        elif provider not in {
+            "openai", "claude", "google", "perplexity", "ensemble", "race"
+        } and not self.openai_api_key:
             problems.append("OPENAI_API_KEY is not set.")
         if not self.ticker:
             problems.append("TICKER is not set.")
@@ -123,6 +186,41 @@ class Config:
         return problems
 
 
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Process-wide Config singleton.
+
+    The ~13 env-var reads and the data-dir mkdir syscall run once; callers
+    needing a variant can dataclasses.replace the shared instance.
+    """
+    return Config()
+
+
+# ---------------------------------------------------------------------------
+# Shared HTTP session
+# ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=1)
+def get_http_session() -> requests.Session:
+    """Process-wide requests.Session with pooling and transient-error retries.
+
+    Reusing one session keeps TCP+TLS connections alive across NewsAPI and
+    Telegram calls instead of paying a fresh handshake per request.
+    """
+    session = requests.Session()
+    # GET only: POST isn't idempotent — a Telegram send that was delivered
+    # but answered 5xx would be re-sent and duplicate the notification.
+    retry = Retry(
+        total=2,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 # ---------------------------------------------------------------------------
 # Disclaimer
 # ---------------------------------------------------------------------------
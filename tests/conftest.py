@@ -0,0 +1,43 @@
+"""Shared pytest fixtures for the signal test suite."""
+
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from src.utils import Config, _env_defaults
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fresh_env_snapshot():
+    # The env-var snapshot behind Config defaults is memoized per process;
+    # reset it around the session so the suite sees the environment as it
+    # is at startup, not a snapshot from an earlier import.
+    _env_defaults.cache_clear()
+    yield
+    _env_defaults.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def default_config() -> Config:
+    """One Config for the whole session.
+
+    The env-var reads and the data-dir mkdir syscall in Config() run once
+    instead of once per test that needs a config.
+    """
+    return Config()
+
+
+@pytest.fixture
+def cfg(default_config: Config) -> Config:
+    """Fresh copy of the session Config for tests that mutate fields."""
+    return dataclasses.replace(default_config)
+
+
+@pytest.fixture
+def tmp_cfg(default_config: Config, tmp_path) -> Config:
+    """Config copy whose data_dir points at the test's tmp_path."""
+    c = dataclasses.replace(default_config)
+    c.data_dir = tmp_path
+    return c
@@ -0,0 +1,202 @@
+"""Tests for signal-history persistence and querying in src.history."""
+
+from __future__ import annotations
+
+import dataclasses
+from unittest.mock import patch
+
+import pytest
+
+# src.history depends on the market models, which drag in pandas/yfinance;
+# skip the module cleanly at collection when they are absent.
+pytest.importorskip("pandas")
+pytest.importorskip("yfinance")
+
+from src.utils import Config
+from src.market import MarketData
+from src.ai_analyze import AnalysisResult
+from src.history import (
+    append_signal_record,
+    load_history,
+    query_history_by_ticker,
+    format_history_table,
+    _indexed_history,
+)
+
+
+# Shared samples — built once at import; the append tests assert these
+# exact field values.
+MARKET_HIST = MarketData(
+    ticker="TEST",
+    last_close=100.0,
+    last_close_date="2024-01-15",
+    sma_7=99.0,
+    sma_21=98.0,
+    close_vs_sma7="above",
+    return_7d_pct=2.5,
+    rsi_14=55.0,
+    bb_upper=105.0,
+    bb_middle=100.0,
+    bb_lower=95.0,
+    bb_position="inside",
+    vol_10d_avg=1_000_000.0,
+    vol_vs_avg="normal",
+    prices_available=30,
+)
+AI_HIST = AnalysisResult(
+    news_sentiment="positive",
+    key_drivers=["strong earnings"],
+    risk_factors=["macro headwinds"],
+    directional_bias="likely_up",
+    confidence_0_100=75,
+    one_paragraph_rationale="Test rationale.",
+)
+
+
+# ---------------------------------------------------------------------------
+# Signal history (S2)
+# ---------------------------------------------------------------------------
+
+class TestSignalHistory:
+    @staticmethod
+    @pytest.fixture(scope="class")
+    def history_records(default_config: Config, tmp_path_factory) -> list[dict]:
+        """Two records appended and loaded once, shared across the class.
+
+        The append + open + parse pass runs a single time instead of once
+        per test; tests assert against slices of the memoized list.
+        """
+        cfg = dataclasses.replace(default_config)
+        cfg.data_dir = tmp_path_factory.mktemp("history")
+        append_signal_record(cfg, MARKET_HIST, AI_HIST, "high_conviction_up")
+        append_signal_record(cfg, MARKET_HIST, AI_HIST, "likely_down")
+        return load_history(cfg)
+
+    def test_append_creates_file(self, tmp_cfg: Config, tmp_path) -> None:
+        append_signal_record(tmp_cfg, MARKET_HIST, AI_HIST, "likely_up")
+        assert (tmp_path / "signal_history.jsonl").exists()
+
+    def test_append_writes_valid_json_with_expected_fields(self, history_records: list[dict]) -> None:
+        record = history_records[0]
+        assert record["ticker"] == "TEST"
+        assert record["final_signal"] == "high_conviction_up"
+        assert record["confidence_0_100"] == 75
+        assert record["last_close"] == 100.0
+        assert record["last_close_date"] == "2024-01-15"
+        assert "run_at" in record
+
+    def test_load_returns_empty_when_no_file(self, tmp_cfg: Config) -> None:
+        assert load_history(tmp_cfg) == []
+
+    def test_load_returns_all_appended_records(self, history_records: list[dict]) -> None:
+        assert len(history_records) == 2
+
+    def test_append_preserves_signal_order(self, history_records: list[dict]) -> None:
+        assert history_records[0]["final_signal"] == "high_conviction_up"
+        assert history_records[1]["final_signal"] == "likely_down"
+
+    @pytest.fixture
+    def prepared_history(self, tmp_path):
+        """tmp dir pre-populated with a history file containing a bad line.
+
+        write_bytes drops the file in one pass with no encoding step, and
+        the fixture keeps the write out of the test body.
+        """
+        (tmp_path / "signal_history.jsonl").write_bytes(
+            b'{"valid": true}\nNOT VALID JSON\n{"also": "valid"}\n'
+        )
+        return tmp_path
+
+    def test_load_skips_malformed_lines(self, tmp_cfg: Config, prepared_history) -> None:
+        records = load_history(tmp_cfg)
+        assert len(records) == 2
+
+
+# ---------------------------------------------------------------------------
+# History query (H1)
+# ---------------------------------------------------------------------------
+
+class TestHistoryQuery:
+    _FAKE_RECORDS = [
+        {
+            "run_at": "2024-01-01T09:00:00+00:00",
+            "ticker": "MSFT",
+            "final_signal": "likely_up",
+            "confidence_0_100": 65,
+            "last_close": 380.0,
+            "rsi_14": 55.0,
+        },
+        {
+            "run_at": "2024-01-02T09:00:00+00:00",
+            "ticker": "AAPL",
+            "final_signal": "uncertain",
+            "confidence_0_100": 45,
+            "last_close": 190.0,
+            "rsi_14": 50.0,
+        },
+        {
+            "run_at": "2024-01-03T09:00:00+00:00",
+            "ticker": "msft",
+            "final_signal": "likely_down",
+            "confidence_0_100": 70,
+            "last_close": 375.0,
+            "rsi_14": 42.0,
+        },
+    ]
+
+    @pytest.fixture(autouse=True)
+    def _fresh_index(self):
+        # The ticker index is cached per (path, mtime); clear it so the
+        # patched loader is consulted and no fake index leaks out.
+        _indexed_history.cache_clear()
+        yield
+        _indexed_history.cache_clear()
+
+    def test_filter_returns_only_matching_ticker(self, cfg: Config) -> None:
+        with patch("src.history._load_history_path", return_value=self._FAKE_RECORDS):
+            result = query_history_by_ticker(cfg, "MSFT")
+        assert len(result) == 2
+        assert all(r["ticker"].upper() == "MSFT" for r in result)
+
+    def test_filter_case_insensitive(self, cfg: Config) -> None:
+        with patch("src.history._load_history_path", return_value=self._FAKE_RECORDS):
+            result_lower = query_history_by_ticker(cfg, "msft")
+            result_upper = query_history_by_ticker(cfg, "MSFT")
+        assert len(result_lower) == len(result_upper) == 2
+
+    def test_filter_returns_newest_first(self, cfg: Config) -> None:
+        with patch("src.history._load_history_path", return_value=self._FAKE_RECORDS):
+            result = query_history_by_ticker(cfg, "MSFT")
+        # Record with run_at 2024-01-03 should come first (newest)
+        assert result[0]["run_at"] > result[1]["run_at"]
+
+    def test_filter_no_match_returns_empty(self, cfg: Config) -> None:
+        with patch("src.history._load_history_path", return_value=self._FAKE_RECORDS):
+            result = query_history_by_ticker(cfg, "GOOG")
+        assert result == []
+
+    def test_format_table_no_records_returns_placeholder(self) -> None:
+        output = format_history_table([])
+        assert output == "(no history yet)"
+
+    def test_format_table_contains_expected_columns(self) -> None:
+        output = format_history_table(self._FAKE_RECORDS[:1])
+        assert "Date" in output
+        assert "Time UTC" in output
+        assert "Signal" in output
+        assert "Conf" in output
+        assert "Close" in output
+        assert "RSI" in output
+
+    def test_format_table_contains_record_data(self) -> None:
+        record = self._FAKE_RECORDS[0]
+        output = format_history_table([record])
+        assert "2024-01-01" in output
+        assert "likely_up" in output
+        assert "65" in output
+        assert "380.00" in output
+
+    def test_format_table_returns_string(self) -> None:
+        output = format_history_table(self._FAKE_RECORDS)
+        assert isinstance(output, str)
+        assert len(output) > 0
@@ -0,0 +1,213 @@
+"""Tests for the indicator helpers and bulk fetcher in src.market."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+# src.market drags in the pandas/yfinance stack; skip the module cleanly
+# at collection when it is absent.
+pytest.importorskip("pandas")
+pytest.importorskip("yfinance")
+
+import pandas as pd
+
+from src.market import (
+    MarketData,
+    fetch_market_data_bulk,
+    _compute_rsi,
+    _compute_bollinger_bands,
+    _compute_volume,
+)
+
+
+# ---------------------------------------------------------------------------
+# Volume analysis (M3)
+# ---------------------------------------------------------------------------
+
+class TestVolumeAnalysis:
+    @staticmethod
+    @pytest.fixture(scope="class")
+    def vol_series() -> dict[str, pd.Series]:
+        """Every volume Series the class needs, built once per class."""
+        return {
+            "flat": pd.Series([1_000_000.0] * 10, dtype=float),
+            "spike": pd.Series([1_000_000.0] * 9 + [2_000_000.0], dtype=float),
+            "dip": pd.Series([1_000_000.0] * 9 + [500_000.0], dtype=float),
+            "old-high": pd.Series(
+                [10_000_000.0] * 10 + [1_000_000.0] * 9 + [2_000_000.0], dtype=float
+            ),
+            "zero": pd.Series([0.0] * 10, dtype=float),
+            "short": pd.Series([1_000_000.0] * 5, dtype=float),
+        }
+
+    @pytest.mark.parametrize(
+        "key,exp_label,exp_avg",
+        [
+            pytest.param("flat", "normal", 1_000_000.0, id="normal-volume"),
+            pytest.param("spike", "high", None, id="high-volume"),
+            pytest.param("dip", "low", None, id="low-volume"),
+            # 20 days of data; the old high volume outside the 10-day
+            # window is ignored.
+            pytest.param("old-high", "high", pytest.approx(1_100_000.0), id="uses-last-10-days"),
+            pytest.param("zero", "normal", 0.0, id="zero-volume"),
+            pytest.param("short", "normal", 1_000_000.0, id="fewer-than-period"),
+        ],
+    )
+    def test_volume(self, vol_series, key: str, exp_label: str, exp_avg) -> None:
+        avg, label = _compute_volume(vol_series[key])
+        assert label == exp_label
+        if exp_avg is not None:
+            assert avg == exp_avg
+
+
+# ---------------------------------------------------------------------------
+# Bollinger Bands (M2)
+# ---------------------------------------------------------------------------
+
+class TestBollingerBands:
+    @staticmethod
+    @pytest.fixture(scope="class")
+    def bb_series() -> dict[str, pd.Series]:
+        """Every price Series the class needs, built once per class."""
+        return {
+            "flat": pd.Series([100.0] * 20, dtype=float),
+            "spike-up": pd.Series([100.0] * 19 + [200.0], dtype=float),
+            "spike-down": pd.Series([100.0] * 19 + [0.0], dtype=float),
+            "cycle": pd.Series([float(98 + i % 5) for i in range(20)], dtype=float),
+            "saw": pd.Series([float(100 + (i % 3)) for i in range(25)], dtype=float),
+            "short-ramp": pd.Series([float(100 + i) for i in range(10)], dtype=float),
+            "ramp-90-109": pd.Series([float(90 + i) for i in range(20)], dtype=float),
+        }
+
+    @pytest.mark.parametrize(
+        "key,check",
+        [
+            # All same price → std=0 → upper=lower=middle=price
+            pytest.param(
+                "flat",
+                lambda u, m, l, pos: u == m == l == 100.0 and pos == "inside",
+                id="flat-bands-collapse",
+            ),
+            pytest.param(
+                "spike-up", lambda u, m, l, pos: pos == "above_upper", id="close-above-upper"
+            ),
+            pytest.param(
+                "spike-down", lambda u, m, l, pos: pos == "below_lower", id="close-below-lower"
+            ),
+            pytest.param("cycle", lambda u, m, l, pos: pos == "inside", id="close-inside"),
+            pytest.param("saw", lambda u, m, l, pos: u >= m >= l, id="bands-ordered"),
+            # Only 10 points — should not raise, should use all 10
+            pytest.param("short-ramp", lambda u, m, l, pos: u > l, id="fewer-than-period"),
+            # Precomputed oracle: mean of the 20-day window [90..109]
+            # is 1990 / 20 = 99.5.
+            pytest.param(
+                "ramp-90-109",
+                lambda u, m, l, pos: m == 99.5,
+                id="middle-equals-window-mean",
+            ),
+        ],
+    )
+    def test_bollinger(self, bb_series, key: str, check) -> None:
+        upper, middle, lower, position = _compute_bollinger_bands(bb_series[key])
+        assert check(upper, middle, lower, position)
+
+
+# ---------------------------------------------------------------------------
+# RSI indicator (M1)
+# ---------------------------------------------------------------------------
+
+class TestRSI:
+    @staticmethod
+    @pytest.fixture(scope="class")
+    def rsi_series() -> dict[str, pd.Series]:
+        """Every price Series the class needs, built once per class."""
+        return {
+            "short-flat": pd.Series([100.0] * 10, dtype=float),
+            "all-gains": pd.Series([float(100 + i) for i in range(15)], dtype=float),
+            "all-losses": pd.Series([float(114 - i) for i in range(15)], dtype=float),
+            "alternating": pd.Series(
+                [100.0, 101.0, 100.0, 101.0, 100.0, 101.0, 100.0,
+                 101.0, 100.0, 101.0, 100.0, 101.0, 100.0, 101.0, 100.0],
+                dtype=float,
+            ),
+            "uptrend": pd.Series(
+                [100.0, 101.0, 102.0, 103.0, 104.0, 105.0, 106.0, 107.0,
+                 108.0, 107.0, 108.0, 109.0, 110.0, 111.0, 112.0],
+                dtype=float,
+            ),
+            "downtrend": pd.Series(
+                [112.0, 111.0, 110.0, 109.0, 108.0, 107.0, 106.0, 105.0,
+                 104.0, 105.0, 104.0, 103.0, 102.0, 101.0, 100.0],
+                dtype=float,
+            ),
+            "mixed": pd.Series(
+                [100.0, 102.0, 101.0, 103.0, 102.0, 104.0, 103.0,
+                 105.0, 104.0, 106.0, 105.0, 107.0, 106.0, 108.0, 107.0],
+                dtype=float,
+            ),
+        }
+
+    @pytest.mark.parametrize(
+        "key,check",
+        [
+            # Fewer than period+1 (15) points → neutral fallback
+            pytest.param("short-flat", lambda r: r == 50.0, id="insufficient-data-returns-50"),
+            # Monotonic → no losses/no gains → saturated RSI
+            pytest.param("all-gains", lambda r: r == 100.0, id="all-gains-returns-100"),
+            pytest.param("all-losses", lambda r: r == 0.0, id="all-losses-returns-0"),
+            # Equal alternating gains and losses → RSI ≈ 50
+            pytest.param("alternating", lambda r: abs(r - 50.0) < 1.0, id="alternating-near-50"),
+            pytest.param("uptrend", lambda r: r > 70.0, id="overbought-above-70"),
+            pytest.param("downtrend", lambda r: r < 30.0, id="oversold-below-30"),
+            pytest.param("mixed", lambda r: 0.0 <= r <= 100.0, id="result-in-valid-range"),
+        ],
+    )
+    def test_rsi(self, rsi_series, key: str, check) -> None:
+        assert check(_compute_rsi(rsi_series[key]))
+
+
+# ---------------------------------------------------------------------------
+# Bulk market fetch
+# ---------------------------------------------------------------------------
+
+def _fake_history(days: int = 30, start: float = 100.0) -> pd.DataFrame:
+    """Minimal OHLCV frame shaped like a yfinance single-ticker download."""
+    index = pd.date_range("2024-01-01", periods=days, freq="D")
+    close = [start + i for i in range(days)]
+    return pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Close": close, "Volume": [1e6] * days},
+        index=index,
+    )
+
+
+class TestMarketBulk:
+    def test_bulk_multiindex_returns_all_tickers(self, cfg) -> None:
+        frames = {"AAA": _fake_history(), "BBB": _fake_history(start=200.0)}
+        data = pd.concat(frames, axis=1)  # MultiIndex columns: (ticker, field)
+        with patch("src.market.yf.download", return_value=data):
+            results = fetch_market_data_bulk(cfg, ["AAA", "BBB"])
+        assert set(results) == {"AAA", "BBB"}
+        assert all(isinstance(md, MarketData) for md in results.values())
+        assert results["AAA"].last_close == 129.0
+        assert results["BBB"].last_close == 229.0
+
+    def test_bulk_skips_missing_ticker(self, cfg) -> None:
+        # yfinance returns all-NaN columns for unknown symbols; after the
+        # Close dropna the frame is empty and the ticker is skipped.
+        frames = {"AAA": _fake_history(), "BAD": _fake_history() * float("nan")}
+        data = pd.concat(frames, axis=1)
+        with patch("src.market.yf.download", return_value=data):
+            results = fetch_market_data_bulk(cfg, ["AAA", "BAD", "ABSENT"])
+        assert set(results) == {"AAA"}
+
+    def test_bulk_single_ticker_flat_columns(self, cfg) -> None:
+        # A one-ticker download comes back with flat columns, not MultiIndex.
+        with patch("src.market.yf.download", return_value=_fake_history()):
+            results = fetch_market_data_bulk(cfg, ["AAA"])
+        assert results["AAA"].close_vs_sma7 == "above"
+
+    def test_bulk_insufficient_history_skipped(self, cfg) -> None:
+        with patch("src.market.yf.download", return_value=_fake_history(days=3)):
+            assert fetch_market_data_bulk(cfg, ["AAA"]) == {}
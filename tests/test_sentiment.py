@@ -0,0 +1,86 @@
+"""Tests for the VADER sentiment pre-filter in src.news."""
+
+from __future__ import annotations
+
+import sys
+import types
+
+import pytest
+
+from src.utils import Config
+from src.news import Article, _get_vader, _pre_filter_by_sentiment
+
+
+# sys.modules targets for the VADER patch fixture, interned once.
+_VADER_PKG = "vaderSentiment"
+_VADER_MOD = "vaderSentiment.vaderSentiment"
+
+
+class TestSentimentPreFilter:
+    @pytest.fixture(autouse=True)
+    def _fresh_vader(self):
+        # The analyzer factory is memoized per process; clear it so each
+        # test's sys.modules patch is what the factory imports, and no
+        # mock analyzer leaks into later tests.
+        _get_vader.cache_clear()
+        yield
+        _get_vader.cache_clear()
+
+    class _FakeAnalyzer:
+        """Plain stand-in for SentimentIntensityAnalyzer.
+
+        A tiny class instead of MagicMock: no call-history bookkeeping or
+        child-mock creation per polarity_scores call.
+        """
+
+        def __init__(self, score: float) -> None:
+            self._scores = {"compound": score}
+
+        def polarity_scores(self, _text: str) -> dict[str, float]:
+            return self._scores
+
+    def _article(self, title: str, summary: str = "") -> Article:
+        return Article(title, "Src", "2024-01-01", summary, "https://example.com/1")
+
+    @pytest.fixture
+    def patched_vader(self, request, monkeypatch):
+        """Inject a fake vaderSentiment package via monkeypatch.setitem.
+
+        setitem swaps exactly two sys.modules keys and restores them on
+        teardown — no patch.dict snapshot of the whole modules dict, and
+        the mutation stays local to this test (xdist-safe). types.ModuleType
+        modules expose exactly the configured analyzer class — no MagicMock
+        attribute auto-creation. param None simulates the package being
+        uninstalled.
+        """
+        score = request.param
+        if score is None:
+            monkeypatch.setitem(sys.modules, _VADER_PKG, None)
+            monkeypatch.setitem(sys.modules, _VADER_MOD, None)
+            return
+        fake_mod = types.ModuleType(_VADER_MOD)
+        fake_mod.SentimentIntensityAnalyzer = lambda: self._FakeAnalyzer(score)
+        fake_pkg = types.ModuleType(_VADER_PKG)
+        fake_pkg.vaderSentiment = fake_mod
+        monkeypatch.setitem(sys.modules, _VADER_PKG, fake_pkg)
+        monkeypatch.setitem(sys.modules, _VADER_MOD, fake_mod)
+
+    @pytest.mark.parametrize(
+        "patched_vader,titles,expected",
+        [
+            pytest.param(0.8, ("Stock surges on record earnings",), 1, id="strong-positive-kept"),
+            pytest.param(0.02, ("Company holds annual meeting",), 0, id="near-neutral-dropped"),
+            pytest.param(-0.7, ("Massive layoffs hit company amid losses",), 1, id="strong-negative-kept"),
+            pytest.param(0.0, ("",), 1, id="empty-text-kept"),
+            pytest.param(None, ("Some headline", "Another"), 2, id="import-error-returns-all"),
+        ],
+        indirect=["patched_vader"],
+    )
+    def test_filter_outcomes(self, patched_vader, titles: tuple[str, ...], expected: int) -> None:
+        articles = [self._article(t) for t in titles]
+        result = _pre_filter_by_sentiment(articles, threshold=0.05)
+        assert len(result) == expected
+
+    def test_config_fields_default_off(self, cfg: Config) -> None:
+        assert cfg.pre_filter_sentiment is False
+        assert cfg.sentiment_filter_threshold == 0.05
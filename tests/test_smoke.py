@@ -2,25 +2,78 @@
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import functools
 import json
-from unittest.mock import MagicMock, patch
+import time
+from unittest.mock import patch
 
 import pytest
 
-import pandas as pd
+# The src imports below drag in the pipeline's heavy third-party stack;
+# skip the module cleanly at collection when it is absent instead of
+# erroring partway through the import chain.
+pytest.importorskip("pandas")
+pytest.importorskip("yfinance")
 
 from src.utils import Config, DISCLAIMER
 from src.news import Article, _deduplicate
-from src.market import MarketData, _compute_rsi, _compute_bollinger_bands, _compute_volume
+from src.market import MarketData
+import src.ai_analyze as ai_analyze
 from src.ai_analyze import (
     AnalysisResult,
+    BackendSpec,
+    analyze_async,
+    analyze_ensemble,
+    analyze_race,
+    _cache,
+    _cache_get,
+    _cache_key,
+    _cache_put,
     _parse_analysis,
     _rule_based_fallback,
     _apply_confidence_threshold,
 )
 from src.main import combine_signals, run_pipeline
-from src.news import _pre_filter_by_sentiment
-from src.history import append_signal_record, load_history, query_history_by_ticker, format_history_table
+
+
+# ---------------------------------------------------------------------------
+# Shared sample objects — built once at import. Article and MarketData are
+# frozen, so sharing instances across tests is safe; the AnalysisResult
+# samples are shared by convention (no test mutates them).
+# ---------------------------------------------------------------------------
+
+SAMPLE_ARTICLE = Article("Title", "Src", "2024-01-01", "", "https://example.com/1")
+SAMPLE_ARTICLES_5 = tuple(
+    Article(f"Title {i}", "Src", "2024-01-01", "", f"https://example.com/{i}")
+    for i in range(5)
+)
+MARKET_ABOVE_UP = MarketData(
+    ticker="TEST",
+    last_close=100.0,
+    last_close_date="2024-01-01",
+    sma_7=99.0,
+    sma_21=98.0,
+    close_vs_sma7="above",
+    return_7d_pct=1.5,
+    rsi_14=55.0,
+    bb_upper=105.0,
+    bb_middle=100.0,
+    bb_lower=95.0,
+    bb_position="inside",
+    vol_10d_avg=1_000_000.0,
+    vol_vs_avg="normal",
+    prices_available=30,
+)
+AI_LIKELY_UP = AnalysisResult(
+    news_sentiment="positive",
+    key_drivers=["strong earnings"],
+    risk_factors=["macro risk"],
+    directional_bias="likely_up",
+    confidence_0_100=65,
+    one_paragraph_rationale="All looks good.",
+)
 
 
 # ---------------------------------------------------------------------------
@@ -28,23 +81,22 @@ from src.history import append_signal_record, load_history, query_history_by_tic
 # ---------------------------------------------------------------------------
 
 class TestConfig:
-    def test_defaults_load(self) -> None:
+    def test_defaults_load(self, cfg: Config, default_config: Config) -> None:
         """Config should load with defaults when no env vars set."""
-        cfg = Config()
         assert cfg.topic  # Should have a default
         assert cfg.ticker
-        assert cfg.data_dir.exists()
+        # The data dir was created (and stat'd) when the session template
+        # was built; comparing paths avoids another filesystem hit here.
+        assert cfg.data_dir == default_config.data_dir
 
-    def test_validate_missing_key(self) -> None:
+    def test_validate_missing_key(self, cfg: Config) -> None:
         """Validation should catch missing OPENAI_API_KEY."""
-        cfg = Config()
         cfg.openai_api_key = ""
         problems = cfg.validate()
         assert any("OPENAI_API_KEY" in p for p in problems)
 
-    def test_validate_ok(self) -> None:
+    def test_validate_ok(self, cfg: Config) -> None:
         """No problems when required fields are set."""
-        cfg = Config()
         cfg.openai_api_key = "sk-test"
         assert cfg.validate() == []
 
@@ -62,11 +114,7 @@ class TestNewsDedupe:
         assert len(result) == 2
 
     def test_dedup_keeps_unique(self) -> None:
-        articles = [
-            Article(f"Title {i}", "Src", "2024-01-01", "", f"https://example.com/{i}")
-            for i in range(5)
-        ]
-        result = _deduplicate(articles)
+        result = _deduplicate(list(SAMPLE_ARTICLES_5))
         assert len(result) == 5
 
     def test_dedup_skips_empty_title(self) -> None:
@@ -79,89 +127,97 @@ class TestNewsDedupe:
 # AI JSON parsing
 # ---------------------------------------------------------------------------
 
+# Pre-serialized response payloads — literal JSON strings, no import-time
+# json.dumps round-trip.
+_VALID_RAW = (
+    '{"news_sentiment": "positive", "key_drivers": ["strong earnings"], '
+    '"risk_factors": ["macro headwinds"], "directional_bias": "likely_up", '
+    '"confidence_0_100": 70, "one_paragraph_rationale": "Things look good."}'
+)
+_FENCED_RAW = (
+    '```json\n{"news_sentiment":"neutral","key_drivers":[],"risk_factors":[],'
+    '"directional_bias":"uncertain","confidence_0_100":50,'
+    '"one_paragraph_rationale":"test"}\n```'
+)
+_CLAMP_RAW = (
+    '{"news_sentiment": "mixed", "key_drivers": [], "risk_factors": [], '
+    '"directional_bias": "uncertain", "confidence_0_100": 150, '
+    '"one_paragraph_rationale": "test"}'
+)
+_INVALID_SENT_RAW = (
+    '{"news_sentiment": "INVALID", "key_drivers": [], "risk_factors": [], '
+    '"directional_bias": "uncertain", "confidence_0_100": 50, '
+    '"one_paragraph_rationale": "test"}'
+)
+
+# (raw payload, expected sentiment, expected bias, expected confidence)
+_PARSE_CASES = [
+    pytest.param(_VALID_RAW, "positive", "likely_up", 70, id="valid-json"),
+    pytest.param(_FENCED_RAW, "neutral", "uncertain", 50, id="markdown-fences-stripped"),
+    pytest.param(_CLAMP_RAW, "mixed", "uncertain", 100, id="confidence-clamped"),
+    pytest.param(_INVALID_SENT_RAW, "neutral", "uncertain", 50, id="invalid-sentiment-defaults"),
+]
+
+
 class TestAIParser:
-    def test_parse_valid_json(self) -> None:
-        raw = json.dumps({
-            "news_sentiment": "positive",
-            "key_drivers": ["strong earnings"],
-            "risk_factors": ["macro headwinds"],
-            "directional_bias": "likely_up",
-            "confidence_0_100": 70,
-            "one_paragraph_rationale": "Things look good.",
-        })
+    @pytest.mark.parametrize("raw,exp_sentiment,exp_bias,exp_confidence", _PARSE_CASES)
+    def test_parse(self, raw: str, exp_sentiment: str, exp_bias: str, exp_confidence: int) -> None:
         result = _parse_analysis(raw)
-        assert result.news_sentiment == "positive"
-        assert result.directional_bias == "likely_up"
-        assert result.confidence_0_100 == 70
+        assert result.news_sentiment == exp_sentiment
+        assert result.directional_bias == exp_bias
+        assert result.confidence_0_100 == exp_confidence
 
-    def test_parse_with_markdown_fences(self) -> None:
-        raw = '```json\n{"news_sentiment":"neutral","key_drivers":[],"risk_factors":[],"directional_bias":"uncertain","confidence_0_100":50,"one_paragraph_rationale":"test"}\n```'
-        result = _parse_analysis(raw)
-        assert result.news_sentiment == "neutral"
-
-    def test_parse_invalid_json_raises(self) -> None:
-        with pytest.raises((json.JSONDecodeError, Exception)):
-            _parse_analysis("this is not json")
-
-    def test_parse_clamps_confidence(self) -> None:
-        raw = json.dumps({
-            "news_sentiment": "mixed",
-            "key_drivers": [],
-            "risk_factors": [],
-            "directional_bias": "uncertain",
-            "confidence_0_100": 150,
-            "one_paragraph_rationale": "test",
-        })
-        result = _parse_analysis(raw)
-        assert result.confidence_0_100 == 100
-
-    def test_parse_invalid_sentiment_defaults(self) -> None:
-        raw = json.dumps({
-            "news_sentiment": "INVALID",
-            "key_drivers": [],
-            "risk_factors": [],
-            "directional_bias": "uncertain",
-            "confidence_0_100": 50,
-            "one_paragraph_rationale": "test",
-        })
-        result = _parse_analysis(raw)
-        assert result.news_sentiment == "neutral"
+    @pytest.mark.parametrize("bad", ["this is not json", ""])
+    def test_parse_invalid_json_raises(self, bad: str) -> None:
+        # The position suffix is common to the stdlib and orjson decode
+        # errors; the prefix wording differs between backends.
+        with pytest.raises(json.JSONDecodeError, match="line 1 column 1"):
+            _parse_analysis(bad)
 
 
 # ---------------------------------------------------------------------------
 # Rule-based fallback
 # ---------------------------------------------------------------------------
 
-class TestRuleBased:
-    def _market(self, close_vs_sma7: str = "above", return_7d: float = 1.0) -> MarketData:
-        return MarketData(
-            ticker="TEST",
-            last_close=100.0,
-            last_close_date="2024-01-01",
-            sma_7=99.0,
-            sma_21=98.0,
-            close_vs_sma7=close_vs_sma7,
-            return_7d_pct=return_7d,
-            rsi_14=50.0,
-            bb_upper=105.0,
-            bb_middle=100.0,
-            bb_lower=95.0,
-            bb_position="inside",
-            vol_10d_avg=1_000_000.0,
-            vol_vs_avg="normal",
-            prices_available=30,
-        )
+# Cached sample factories — the handful of distinct MarketData and
+# AnalysisResult combinations the spec tests need are built once each;
+# both models are frozen, so the cached instances are safe to share.
+_BASE_MARKET = MarketData(
+    "TEST", 100.0, "2024-01-01", 99.0, 98.0, "above", 1.0, 50.0,
+    105.0, 100.0, 95.0, "inside", 1_000_000.0, "normal", 30,
+)
+_BASE_AI = AnalysisResult("neutral", [], [], "uncertain", 50, "test")
+_BASE_AI_POSITIVE = AnalysisResult("positive", ["test"], [], "uncertain", 50, "test")
+
+
+@functools.lru_cache(maxsize=None)
+def _market(vs_sma: str, ret: float) -> MarketData:
+    return dataclasses.replace(_BASE_MARKET, close_vs_sma7=vs_sma, return_7d_pct=ret)
+
 
+@functools.lru_cache(maxsize=None)
+def _ai(bias: str, confidence: int) -> AnalysisResult:
+    return dataclasses.replace(_BASE_AI, directional_bias=bias, confidence_0_100=confidence)
+
+
+@functools.lru_cache(maxsize=None)
+def _result(bias: str, confidence: int) -> AnalysisResult:
+    return dataclasses.replace(
+        _BASE_AI_POSITIVE, directional_bias=bias, confidence_0_100=confidence
+    )
+
+
+class TestRuleBased:
     def test_fallback_bullish(self) -> None:
-        result = _rule_based_fallback([], self._market("above", 2.0))
+        result = _rule_based_fallback([], _market("above", 2.0))
         assert result.directional_bias == "likely_up"
 
     def test_fallback_bearish(self) -> None:
-        result = _rule_based_fallback([], self._market("below", -2.0))
+        result = _rule_based_fallback([], _market("below", -2.0))
         assert result.directional_bias == "likely_down"
 
     def test_fallback_mixed(self) -> None:
-        result = _rule_based_fallback([], self._market("above", -1.0))
+        result = _rule_based_fallback([], _market("above", -1.0))
         assert result.directional_bias == "uncertain"
 
 
@@ -169,48 +225,25 @@ class TestRuleBased:
 # Signal combination (imported from main)
 # ---------------------------------------------------------------------------
 
-class TestCombineSignals:
-    def _ai(self, bias: str, confidence: int = 50) -> AnalysisResult:
-        return AnalysisResult(
-            news_sentiment="neutral",
-            key_drivers=[],
-            risk_factors=[],
-            directional_bias=bias,
-            confidence_0_100=confidence,
-            one_paragraph_rationale="test",
-        )
-
-    def _market(self, vs_sma: str, ret: float) -> MarketData:
-        return MarketData("TEST", 100.0, "2024-01-01", 99.0, 98.0, vs_sma, ret, 50.0, 105.0, 100.0, 95.0, "inside", 1_000_000.0, "normal", 30)
-
-    def test_all_bullish(self) -> None:
-        assert combine_signals(self._ai("likely_up"), self._market("above", 1.0)) == "likely_up"
-
-    def test_all_bearish(self) -> None:
-        assert combine_signals(self._ai("likely_down"), self._market("below", -1.0)) == "likely_down"
-
-    def test_conflicting_signals(self) -> None:
-        # AI says up but market says below SMA
-        assert combine_signals(self._ai("likely_up"), self._market("below", 1.0)) == "uncertain"
-
-    def test_ai_uncertain(self) -> None:
-        assert combine_signals(self._ai("uncertain"), self._market("above", 1.0)) == "uncertain"
+# (ai bias, ai confidence, close vs sma7, 7d return, expected signal) —
+# the full specification matrix for combine_signals.
+_COMBINE_CASES = [
+    pytest.param("likely_up", 50, "above", 1.0, "likely_up", id="all-bullish"),
+    pytest.param("likely_down", 50, "below", -1.0, "likely_down", id="all-bearish"),
+    pytest.param("likely_up", 50, "below", 1.0, "uncertain", id="conflicting-signals"),
+    pytest.param("uncertain", 50, "above", 1.0, "uncertain", id="ai-uncertain"),
+    pytest.param("likely_up", 70, "above", 1.0, "high_conviction_up", id="high-conviction-up"),
+    pytest.param("likely_down", 75, "below", -1.0, "high_conviction_down", id="high-conviction-down"),
+    pytest.param("likely_up", 69, "above", 1.0, "likely_up", id="below-threshold-stays-likely-up"),
+    pytest.param("likely_up", 70, "above", 1.0, "high_conviction_up", id="at-threshold-is-high-conviction"),
+    pytest.param("likely_up", 90, "below", -1.0, "uncertain", id="high-conviction-needs-technicals"),
+]
 
-    def test_high_conviction_up(self) -> None:
-        assert combine_signals(self._ai("likely_up", 70), self._market("above", 1.0)) == "high_conviction_up"
 
-    def test_high_conviction_down(self) -> None:
-        assert combine_signals(self._ai("likely_down", 75), self._market("below", -1.0)) == "high_conviction_down"
-
-    def test_confidence_below_threshold_stays_likely_up(self) -> None:
-        assert combine_signals(self._ai("likely_up", 69), self._market("above", 1.0)) == "likely_up"
-
-    def test_confidence_at_threshold_is_high_conviction(self) -> None:
-        assert combine_signals(self._ai("likely_up", 70), self._market("above", 1.0)) == "high_conviction_up"
-
-    def test_high_conviction_requires_technical_confirmation(self) -> None:
-        # High confidence but conflicting technicals → uncertain, not high_conviction
-        assert combine_signals(self._ai("likely_up", 90), self._market("below", -1.0)) == "uncertain"
+class TestCombineSignals:
+    @pytest.mark.parametrize("bias,confidence,vs_sma,ret,expected", _COMBINE_CASES)
+    def test_combine(self, bias: str, confidence: int, vs_sma: str, ret: float, expected: str) -> None:
+        assert combine_signals(_ai(bias, confidence), _market(vs_sma, ret)) == expected
 
 
 # ---------------------------------------------------------------------------
@@ -218,244 +251,170 @@ class TestCombineSignals:
 # ---------------------------------------------------------------------------
 
 class TestConfidenceThreshold:
-    def _result(self, bias: str, confidence: int) -> AnalysisResult:
-        return AnalysisResult(
-            news_sentiment="positive",
-            key_drivers=["test"],
-            risk_factors=[],
-            directional_bias=bias,
-            confidence_0_100=confidence,
-            one_paragraph_rationale="test",
-        )
-
-    def test_above_threshold_bias_unchanged(self) -> None:
-        result = _apply_confidence_threshold(self._result("likely_up", 50), threshold=40)
-        assert result.directional_bias == "likely_up"
-
-    def test_below_threshold_overrides_to_uncertain(self) -> None:
-        result = _apply_confidence_threshold(self._result("likely_up", 30), threshold=40)
-        assert result.directional_bias == "uncertain"
-
-    def test_at_threshold_bias_unchanged(self) -> None:
-        # confidence == threshold → keep (only override when strictly less than)
-        result = _apply_confidence_threshold(self._result("likely_down", 40), threshold=40)
-        assert result.directional_bias == "likely_down"
+    @staticmethod
+    @pytest.fixture(scope="class")
+    def results() -> dict[str, AnalysisResult]:
+        """The four (bias, confidence) inputs, built once per class."""
+        return {
+            "up_50": _result("likely_up", 50),
+            "up_30": _result("likely_up", 30),
+            "down_40": _result("likely_down", 40),
+            "down_0": _result("likely_down", 0),
+        }
+
+    @pytest.mark.parametrize(
+        "key,expected_bias",
+        [
+            pytest.param("up_50", "likely_up", id="above-threshold-unchanged"),
+            pytest.param("up_30", "uncertain", id="below-threshold-overridden"),
+            # confidence == threshold → keep (only override when strictly less than)
+            pytest.param("down_40", "likely_down", id="at-threshold-unchanged"),
+            pytest.param("down_0", "uncertain", id="zero-confidence-overridden"),
+        ],
+    )
+    def test_threshold(self, results, key: str, expected_bias: str) -> None:
+        result = _apply_confidence_threshold(results[key], threshold=40)
+        assert result.directional_bias == expected_bias
 
     def test_override_preserves_other_fields(self) -> None:
-        original = self._result("likely_up", 25)
+        original = _result("likely_up", 25)
         result = _apply_confidence_threshold(original, threshold=40)
         assert result.directional_bias == "uncertain"
         assert result.news_sentiment == "positive"
         assert result.confidence_0_100 == 25
         assert result.key_drivers == ["test"]
 
-    def test_config_default_threshold_is_40(self) -> None:
-        cfg = Config()
+    def test_config_default_threshold_is_40(self, cfg: Config) -> None:
         assert cfg.confidence_threshold == 40
 
-    def test_zero_confidence_overrides(self) -> None:
-        result = _apply_confidence_threshold(self._result("likely_down", 0), threshold=40)
-        assert result.directional_bias == "uncertain"
-
 
 # ---------------------------------------------------------------------------
-# Disclaimer presence
+# Multi-provider strategies (ensemble / race)
 # ---------------------------------------------------------------------------
 
-# ---------------------------------------------------------------------------
-# Volume analysis (M3)
-# ---------------------------------------------------------------------------
+# Stub provider payloads: the fast backend answers instantly with modest
+# confidence, the slow one answers later with higher confidence.
+_FAST_RAW = (
+    '{"news_sentiment": "positive", "key_drivers": [], "risk_factors": [], '
+    '"directional_bias": "likely_up", "confidence_0_100": 60, '
+    '"one_paragraph_rationale": "fast"}'
+)
+_SLOW_RAW = (
+    '{"news_sentiment": "negative", "key_drivers": [], "risk_factors": [], '
+    '"directional_bias": "likely_down", "confidence_0_100": 90, '
+    '"one_paragraph_rationale": "slow"}'
+)
+
 
-class TestVolumeAnalysis:
-    def _series(self, volumes: list[float]) -> pd.Series:
-        return pd.Series(volumes, dtype=float)
-
-    def test_normal_volume_classified(self) -> None:
-        # Today's volume equal to avg → "normal"
-        vols = [1_000_000.0] * 10
-        avg, label = _compute_volume(self._series(vols))
-        assert label == "normal"
-        assert avg == 1_000_000.0
-
-    def test_high_volume_classified(self) -> None:
-        # Today's volume > 1.5x avg
-        vols = [1_000_000.0] * 9 + [2_000_000.0]
-        _, label = _compute_volume(self._series(vols))
-        assert label == "high"
-
-    def test_low_volume_classified(self) -> None:
-        # Today's volume < 0.75x avg
-        vols = [1_000_000.0] * 9 + [500_000.0]
-        _, label = _compute_volume(self._series(vols))
-        assert label == "low"
-
-    def test_uses_last_10_days(self) -> None:
-        # 20 days of data; only last 10 should matter
-        old_vols = [10_000_000.0] * 10   # old high volume ignored
-        recent_vols = [1_000_000.0] * 9 + [2_000_000.0]
-        avg, label = _compute_volume(self._series(old_vols + recent_vols))
-        assert label == "high"
-        assert avg == pytest.approx(1_100_000.0)
-
-    def test_zero_volume_returns_normal(self) -> None:
-        vols = [0.0] * 10
-        avg, label = _compute_volume(self._series(vols))
-        assert avg == 0.0
-        assert label == "normal"
-
-    def test_fewer_than_period_uses_available(self) -> None:
-        vols = [1_000_000.0] * 5
-        avg, label = _compute_volume(self._series(vols))
-        assert avg == 1_000_000.0
-        assert label == "normal"
+class TestMultiProvider:
+    @pytest.fixture
+    def multi_cfg(self, tmp_cfg: Config, monkeypatch) -> Config:
+        """Config wired to two stub backends: fast/low-conf and slow/high-conf."""
+        async def fast(cfg: Config, prompt: str, model: str) -> str:
+            return _FAST_RAW
+
+        async def slow(cfg: Config, prompt: str, model: str) -> str:
+            await asyncio.sleep(0.05)
+            return _SLOW_RAW
+
+        monkeypatch.setattr(ai_analyze, "_BACKENDS", {
+            "openai": BackendSpec(
+                "openai", "Fast", "openai_api_key", "OPENAI_API_KEY", "openai_model", fast
+            ),
+            "claude": BackendSpec(
+                "claude", "Slow", "claude_api_key", "CLAUDE_API_KEY", "claude_model", slow
+            ),
+        })
+        tmp_cfg.openai_api_key = "k-fast"
+        tmp_cfg.claude_api_key = "k-slow"
+        tmp_cfg.enable_analysis_cache = False
+        return tmp_cfg
 
+    def test_race_returns_fastest(self, multi_cfg: Config) -> None:
+        result = asyncio.run(analyze_race([SAMPLE_ARTICLE], MARKET_ABOVE_UP, multi_cfg))
+        assert result.directional_bias == "likely_up"
+        assert result.confidence_0_100 == 60
 
-# ---------------------------------------------------------------------------
-# Bollinger Bands (M2)
-# ---------------------------------------------------------------------------
+    def test_ensemble_picks_highest_confidence(self, multi_cfg: Config) -> None:
+        result = asyncio.run(analyze_ensemble([SAMPLE_ARTICLE], MARKET_ABOVE_UP, multi_cfg))
+        assert result.directional_bias == "likely_down"
+        assert result.confidence_0_100 == 90
+
+    @pytest.mark.parametrize(
+        "provider,expected_bias",
+        [
+            pytest.param("race", "likely_up", id="race-dispatch"),
+            pytest.param("ensemble", "likely_down", id="ensemble-dispatch"),
+        ],
+    )
+    def test_analyze_async_dispatches_strategies(
+        self, multi_cfg: Config, provider: str, expected_bias: str
+    ) -> None:
+        multi_cfg.ai_provider = provider
+        result = asyncio.run(analyze_async([SAMPLE_ARTICLE], MARKET_ABOVE_UP, multi_cfg))
+        assert result.directional_bias == expected_bias
+
+    def test_race_all_failures_falls_back_to_rules(self, multi_cfg: Config, monkeypatch) -> None:
+        async def broken(cfg: Config, prompt: str, model: str) -> str:
+            raise RuntimeError("provider down")
+
+        monkeypatch.setattr(ai_analyze, "_BACKENDS", {
+            "openai": BackendSpec(
+                "openai", "Broken", "openai_api_key", "OPENAI_API_KEY", "openai_model", broken
+            ),
+        })
+        result = asyncio.run(analyze_race([SAMPLE_ARTICLE], MARKET_ABOVE_UP, multi_cfg))
+        # MARKET_ABOVE_UP is above SMA7 with a positive return -> bullish rules
+        assert result.directional_bias == "likely_up"
 
-class TestBollingerBands:
-    def _series(self, prices: list[float]) -> pd.Series:
-        return pd.Series(prices, dtype=float)
-
-    def test_flat_prices_bands_straddle_mean(self) -> None:
-        # All same price → std=0 → upper=lower=middle=price
-        prices = [100.0] * 20
-        upper, middle, lower, position = _compute_bollinger_bands(self._series(prices))
-        assert upper == middle == lower == 100.0
-        assert position == "inside"
-
-    def test_close_above_upper_position(self) -> None:
-        # Last price far above the band
-        prices = [100.0] * 19 + [200.0]
-        _, _, _, position = _compute_bollinger_bands(self._series(prices))
-        assert position == "above_upper"
-
-    def test_close_below_lower_position(self) -> None:
-        # Last price far below the band
-        prices = [100.0] * 19 + [0.0]
-        _, _, _, position = _compute_bollinger_bands(self._series(prices))
-        assert position == "below_lower"
-
-    def test_close_inside_position(self) -> None:
-        prices = [float(98 + i % 5) for i in range(20)]
-        upper, middle, lower, position = _compute_bollinger_bands(self._series(prices))
-        assert position == "inside"
-
-    def test_upper_greater_than_lower(self) -> None:
-        prices = [float(100 + (i % 3)) for i in range(25)]
-        upper, middle, lower, _ = _compute_bollinger_bands(self._series(prices))
-        assert upper >= middle >= lower
-
-    def test_fewer_than_period_uses_available(self) -> None:
-        # Only 10 points — should not raise, should use all 10
-        prices = [float(100 + i) for i in range(10)]
-        upper, middle, lower, _ = _compute_bollinger_bands(self._series(prices))
-        assert upper > lower
-
-    def test_middle_equals_window_mean(self) -> None:
-        prices = [float(90 + i) for i in range(20)]
-        _, middle, _, _ = _compute_bollinger_bands(self._series(prices))
-        assert middle == round(sum(prices) / len(prices), 2)
+    def test_validate_accepts_strategy_providers(self, cfg: Config) -> None:
+        cfg.ai_provider = "ensemble"
+        cfg.openai_api_key = "sk-test"
+        assert cfg.validate() == []
+        cfg.openai_api_key = ""
+        cfg.claude_api_key = ""
+        cfg.google_api_key = ""
+        cfg.perplexity_api_key = ""
+        assert any("at least one" in p for p in cfg.validate())
 
 
 # ---------------------------------------------------------------------------
-# RSI indicator (M1)
+# Analysis result cache
 # ---------------------------------------------------------------------------
 
-class TestRSI:
-    def _series(self, prices: list[float]) -> pd.Series:
-        return pd.Series(prices, dtype=float)
-
-    def test_insufficient_data_returns_50(self) -> None:
-        # Fewer than period+1 (15) points → neutral fallback
-        result = _compute_rsi(self._series([100.0] * 10))
-        assert result == 50.0
-
-    def test_all_gains_returns_100(self) -> None:
-        # Monotonically increasing → no losses → RSI = 100
-        prices = [float(100 + i) for i in range(15)]
-        result = _compute_rsi(self._series(prices))
-        assert result == 100.0
-
-    def test_all_losses_returns_0(self) -> None:
-        # Monotonically decreasing → no gains → RSI = 0
-        prices = [float(114 - i) for i in range(15)]
-        result = _compute_rsi(self._series(prices))
-        assert result == 0.0
-
-    def test_neutral_alternating_near_50(self) -> None:
-        # Equal alternating gains and losses → RSI ≈ 50
-        prices = [100.0 + (1.0 if i % 2 == 0 else -1.0) * (i % 2) for i in range(15)]
-        prices = [100.0, 101.0, 100.0, 101.0, 100.0, 101.0, 100.0,
-                  101.0, 100.0, 101.0, 100.0, 101.0, 100.0, 101.0, 100.0]
-        result = _compute_rsi(self._series(prices))
-        assert abs(result - 50.0) < 1.0
-
-    def test_overbought_above_70(self) -> None:
-        # 13 gains, 1 loss → strong uptrend → RSI > 70
-        prices = [100.0, 101.0, 102.0, 103.0, 104.0, 105.0, 106.0, 107.0,
-                  108.0, 107.0, 108.0, 109.0, 110.0, 111.0, 112.0]
-        result = _compute_rsi(self._series(prices))
-        assert result > 70.0
-
-    def test_oversold_below_30(self) -> None:
-        # 1 gain, 13 losses → strong downtrend → RSI < 30
-        prices = [112.0, 111.0, 110.0, 109.0, 108.0, 107.0, 106.0, 105.0,
-                  104.0, 105.0, 104.0, 103.0, 102.0, 101.0, 100.0]
-        result = _compute_rsi(self._series(prices))
-        assert result < 30.0
-
-    def test_result_in_valid_range(self) -> None:
-        prices = [100.0, 102.0, 101.0, 103.0, 102.0, 104.0, 103.0,
-                  105.0, 104.0, 106.0, 105.0, 107.0, 106.0, 108.0, 107.0]
-        result = _compute_rsi(self._series(prices))
-        assert 0.0 <= result <= 100.0
+class TestAnalysisCache:
+    def test_cache_key_stable_for_same_inputs(self, cfg: Config) -> None:
+        k1 = _cache_key([SAMPLE_ARTICLE], MARKET_ABOVE_UP, cfg, "openai")
+        k2 = _cache_key([SAMPLE_ARTICLE], MARKET_ABOVE_UP, cfg, "openai")
+        assert k1 == k2
+
+    def test_cache_key_differs_per_provider(self, cfg: Config) -> None:
+        k1 = _cache_key([SAMPLE_ARTICLE], MARKET_ABOVE_UP, cfg, "openai")
+        k2 = _cache_key([SAMPLE_ARTICLE], MARKET_ABOVE_UP, cfg, "claude")
+        assert k1 != k2
+
+    def test_cache_roundtrip_and_ttl_expiry(self) -> None:
+        result = AnalysisResult("neutral", [], [], "uncertain", 50, "test")
+        _cache_put("test-key", result)
+        assert _cache_get("test-key", ttl=300) is result
+        # Simulate an expired entry
+        _cache["test-key"] = (time.time() - 301, result)
+        assert _cache_get("test-key", ttl=300) is None
 
 
 class TestRunPipeline:
     """Tests for the run_pipeline() function extracted from main()."""
 
-    def _make_market(self) -> MarketData:
-        return MarketData(
-            ticker="TEST",
-            last_close=100.0,
-            last_close_date="2024-01-01",
-            sma_7=99.0,
-            sma_21=98.0,
-            close_vs_sma7="above",
-            return_7d_pct=1.5,
-            rsi_14=55.0,
-            bb_upper=105.0,
-            bb_middle=100.0,
-            bb_lower=95.0,
-            bb_position="inside",
-            vol_10d_avg=1_000_000.0,
-            vol_vs_avg="normal",
-            prices_available=30,
-        )
-
-    def _make_ai(self) -> AnalysisResult:
-        return AnalysisResult(
-            news_sentiment="positive",
-            key_drivers=["strong earnings"],
-            risk_factors=["macro risk"],
-            directional_bias="likely_up",
-            confidence_0_100=65,
-            one_paragraph_rationale="All looks good.",
-        )
-
-    def test_run_pipeline_returns_five_tuple(self) -> None:
+    def test_run_pipeline_returns_five_tuple(self, cfg: Config) -> None:
         """run_pipeline should return a 5-tuple of the expected types."""
-        cfg = Config()
         cfg.openai_api_key = "sk-test"
         cfg.topic = "Microsoft"
         cfg.ticker = "MSFT"
 
         with (
             patch("src.main.fetch_news", return_value=[]),
-            patch("src.main.fetch_market_data", return_value=self._make_market()),
-            patch("src.main.analyze", return_value=self._make_ai()),
+            patch("src.main.fetch_market_data", return_value=MARKET_ABOVE_UP),
+            patch("src.main.analyze", return_value=AI_LIKELY_UP),
         ):
             result = run_pipeline(cfg)
 
@@ -468,9 +427,8 @@ class TestRunPipeline:
         assert isinstance(final_signal, str)
         assert isinstance(report, str)
 
-    def test_run_pipeline_market_error_raises(self) -> None:
+    def test_run_pipeline_market_error_raises(self, cfg: Config) -> None:
         """run_pipeline should raise ValueError (not sys.exit) on market failure."""
-        cfg = Config()
         cfg.openai_api_key = "sk-test"
         cfg.topic = "Microsoft"
         cfg.ticker = "INVALID"
@@ -482,17 +440,16 @@ class TestRunPipeline:
             with pytest.raises(ValueError, match="No data for ticker"):
                 run_pipeline(cfg)
 
-    def test_run_pipeline_report_contains_disclaimer(self) -> None:
+    def test_run_pipeline_report_contains_disclaimer(self, cfg: Config) -> None:
         """The report returned by run_pipeline must contain the DISCLAIMER text."""
-        cfg = Config()
         cfg.openai_api_key = "sk-test"
         cfg.topic = "Microsoft"
         cfg.ticker = "MSFT"
 
         with (
             patch("src.main.fetch_news", return_value=[]),
-            patch("src.main.fetch_market_data", return_value=self._make_market()),
-            patch("src.main.analyze", return_value=self._make_ai()),
+            patch("src.main.fetch_market_data", return_value=MARKET_ABOVE_UP),
+            patch("src.main.analyze", return_value=AI_LIKELY_UP),
         ):
             _, _, _, _, report = run_pipeline(cfg)
 
@@ -503,230 +460,3 @@ class TestDisclaimer:
     def test_disclaimer_not_empty(self) -> None:
         assert len(DISCLAIMER) > 50
         assert "financial advice" in DISCLAIMER.lower() or "NOT" in DISCLAIMER
-
-
-# ---------------------------------------------------------------------------
-# Signal history (S2)
-# ---------------------------------------------------------------------------
-
-class TestSignalHistory:
-    def _market(self) -> MarketData:
-        return MarketData(
-            ticker="TEST",
-            last_close=100.0,
-            last_close_date="2024-01-15",
-            sma_7=99.0,
-            sma_21=98.0,
-            close_vs_sma7="above",
-            return_7d_pct=2.5,
-            rsi_14=55.0,
-            bb_upper=105.0,
-            bb_middle=100.0,
-            bb_lower=95.0,
-            bb_position="inside",
-            vol_10d_avg=1_000_000.0,
-            vol_vs_avg="normal",
-            prices_available=30,
-        )
-
-    def _ai(self) -> AnalysisResult:
-        return AnalysisResult(
-            news_sentiment="positive",
-            key_drivers=["strong earnings"],
-            risk_factors=["macro headwinds"],
-            directional_bias="likely_up",
-            confidence_0_100=75,
-            one_paragraph_rationale="Test rationale.",
-        )
-
-    def test_append_creates_file(self, tmp_path) -> None:
-        cfg = Config()
-        cfg.data_dir = tmp_path
-        append_signal_record(cfg, self._market(), self._ai(), "likely_up")
-        assert (tmp_path / "signal_history.jsonl").exists()
-
-    def test_append_writes_valid_json_with_expected_fields(self, tmp_path) -> None:
-        cfg = Config()
-        cfg.data_dir = tmp_path
-        append_signal_record(cfg, self._market(), self._ai(), "likely_up")
-        raw = (tmp_path / "signal_history.jsonl").read_text().strip()
-        record = json.loads(raw)
-        assert record["ticker"] == "TEST"
-        assert record["final_signal"] == "likely_up"
-        assert record["confidence_0_100"] == 75
-        assert record["last_close"] == 100.0
-        assert record["last_close_date"] == "2024-01-15"
-        assert "run_at" in record
-
-    def test_load_returns_empty_when_no_file(self, tmp_path) -> None:
-        cfg = Config()
-        cfg.data_dir = tmp_path
-        assert load_history(cfg) == []
-
-    def test_load_returns_all_appended_records(self, tmp_path) -> None:
-        cfg = Config()
-        cfg.data_dir = tmp_path
-        append_signal_record(cfg, self._market(), self._ai(), "likely_up")
-        append_signal_record(cfg, self._market(), self._ai(), "uncertain")
-        records = load_history(cfg)
-        assert len(records) == 2
-
-    def test_append_preserves_signal_order(self, tmp_path) -> None:
-        cfg = Config()
-        cfg.data_dir = tmp_path
-        append_signal_record(cfg, self._market(), self._ai(), "high_conviction_up")
-        append_signal_record(cfg, self._market(), self._ai(), "likely_down")
-        records = load_history(cfg)
-        assert records[0]["final_signal"] == "high_conviction_up"
-        assert records[1]["final_signal"] == "likely_down"
-
-    def test_load_skips_malformed_lines(self, tmp_path) -> None:
-        cfg = Config()
-        cfg.data_dir = tmp_path
-        hist_file = tmp_path / "signal_history.jsonl"
-        hist_file.write_text('{"valid": true}\nNOT VALID JSON\n{"also": "valid"}\n')
-        records = load_history(cfg)
-        assert len(records) == 2
-
-
-# ---------------------------------------------------------------------------
-# Sentiment pre-filter (N1)
-# ---------------------------------------------------------------------------
-
-class TestSentimentPreFilter:
-    def _article(self, title: str, summary: str = "") -> Article:
-        return Article(title, "Src", "2024-01-01", summary, "https://example.com/1")
-
-    def _mock_analyzer(self, score: float) -> MagicMock:
-        analyzer = MagicMock()
-        analyzer.polarity_scores.return_value = {"compound": score}
-        return analyzer
-
-    def test_strong_positive_kept(self) -> None:
-        articles = [self._article("Stock surges on record earnings")]
-        with patch("src.news.SentimentIntensityAnalyzer" if False else "vaderSentiment.vaderSentiment.SentimentIntensityAnalyzer") as mock_cls:
-            mock_cls.return_value = self._mock_analyzer(0.8)
-            with patch.dict("sys.modules", {"vaderSentiment": MagicMock(), "vaderSentiment.vaderSentiment": MagicMock(SentimentIntensityAnalyzer=mock_cls)}):
-                result = _pre_filter_by_sentiment(articles, threshold=0.05)
-        assert len(result) == 1
-
-    def test_near_neutral_dropped(self) -> None:
-        articles = [self._article("Company holds annual meeting")]
-        with patch("vaderSentiment.vaderSentiment.SentimentIntensityAnalyzer") as mock_cls:
-            mock_cls.return_value = self._mock_analyzer(0.02)
-            with patch.dict("sys.modules", {"vaderSentiment": MagicMock(), "vaderSentiment.vaderSentiment": MagicMock(SentimentIntensityAnalyzer=mock_cls)}):
-                result = _pre_filter_by_sentiment(articles, threshold=0.05)
-        assert len(result) == 0
-
-    def test_strong_negative_kept(self) -> None:
-        articles = [self._article("Massive layoffs hit company amid losses")]
-        with patch("vaderSentiment.vaderSentiment.SentimentIntensityAnalyzer") as mock_cls:
-            mock_cls.return_value = self._mock_analyzer(-0.7)
-            with patch.dict("sys.modules", {"vaderSentiment": MagicMock(), "vaderSentiment.vaderSentiment": MagicMock(SentimentIntensityAnalyzer=mock_cls)}):
-                result = _pre_filter_by_sentiment(articles, threshold=0.05)
-        assert len(result) == 1
-
-    def test_empty_title_article_kept(self) -> None:
-        articles = [Article("", "Src", "2024-01-01", "", "https://example.com/empty")]
-        with patch("vaderSentiment.vaderSentiment.SentimentIntensityAnalyzer") as mock_cls:
-            mock_cls.return_value = self._mock_analyzer(0.0)
-            with patch.dict("sys.modules", {"vaderSentiment": MagicMock(), "vaderSentiment.vaderSentiment": MagicMock(SentimentIntensityAnalyzer=mock_cls)}):
-                result = _pre_filter_by_sentiment(articles, threshold=0.05)
-        assert len(result) == 1
-
-    def test_import_error_returns_all(self) -> None:
-        articles = [self._article("Some headline"), self._article("Another")]
-        with patch.dict("sys.modules", {"vaderSentiment": None, "vaderSentiment.vaderSentiment": None}):
-            result = _pre_filter_by_sentiment(articles, threshold=0.05)
-        assert len(result) == 2
-
-    def test_config_fields_default_off(self) -> None:
-        cfg = Config()
-        assert cfg.pre_filter_sentiment is False
-        assert cfg.sentiment_filter_threshold == 0.05
-
-
-# ---------------------------------------------------------------------------
-# History query (H1)
-# ---------------------------------------------------------------------------
-
-class TestHistoryQuery:
-    _FAKE_RECORDS = [
-        {
-            "run_at": "2024-01-01T09:00:00+00:00",
-            "ticker": "MSFT",
-            "final_signal": "likely_up",
-            "confidence_0_100": 65,
-            "last_close": 380.0,
-            "rsi_14": 55.0,
-        },
-        {
-            "run_at": "2024-01-02T09:00:00+00:00",
-            "ticker": "AAPL",
-            "final_signal": "uncertain",
-            "confidence_0_100": 45,
-            "last_close": 190.0,
-            "rsi_14": 50.0,
-        },
-        {
-            "run_at": "2024-01-03T09:00:00+00:00",
-            "ticker": "msft",
-            "final_signal": "likely_down",
-            "confidence_0_100": 70,
-            "last_close": 375.0,
-            "rsi_14": 42.0,
-        },
-    ]
-
-    def test_filter_returns_only_matching_ticker(self) -> None:
-        with patch("src.history.load_history", return_value=self._FAKE_RECORDS):
-            cfg = Config()
-            result = query_history_by_ticker(cfg, "MSFT")
-        assert len(result) == 2
-        assert all(r["ticker"].upper() == "MSFT" for r in result)
-
-    def test_filter_case_insensitive(self) -> None:
-        with patch("src.history.load_history", return_value=self._FAKE_RECORDS):
-            cfg = Config()
-            result_lower = query_history_by_ticker(cfg, "msft")
-            result_upper = query_history_by_ticker(cfg, "MSFT")
-        assert len(result_lower) == len(result_upper) == 2
-
-    def test_filter_returns_newest_first(self) -> None:
-        with patch("src.history.load_history", return_value=self._FAKE_RECORDS):
-            cfg = Config()
-            result = query_history_by_ticker(cfg, "MSFT")
-        # Record with run_at 2024-01-03 should come first (newest)
-        assert result[0]["run_at"] > result[1]["run_at"]
-
-    def test_filter_no_match_returns_empty(self) -> None:
-        with patch("src.history.load_history", return_value=self._FAKE_RECORDS):
-            cfg = Config()
-            result = query_history_by_ticker(cfg, "GOOG")
-        assert result == []
-
-    def test_format_table_no_records_returns_placeholder(self) -> None:
-        output = format_history_table([])
-        assert output == "(no history yet)"
-
-    def test_format_table_contains_expected_columns(self) -> None:
-        output = format_history_table(self._FAKE_RECORDS[:1])
-        assert "Date" in output
-        assert "Time UTC" in output
-        assert "Signal" in output
-        assert "Conf" in output
-        assert "Close" in output
-        assert "RSI" in output
-
-    def test_format_table_contains_record_data(self) -> None:
-        record = self._FAKE_RECORDS[0]
-        output = format_history_table([record])
-        assert "2024-01-01" in output
-        assert "likely_up" in output
-        assert "65" in output
-        assert "380.00" in output
-
-    def test_format_table_returns_string(self) -> None:
-        output = format_history_table(self._FAKE_RECORDS)
-        assert isinstance(output, str)
-        assert len(output) > 0